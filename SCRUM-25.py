@@ -1,5 +1,12 @@
-```python
-from flask import Flask, jsonify
+import os
+
+from flask import Flask, Response, jsonify, request
+
+from src.store.encoding import dumps
+from src.store.export import NDJSON_MEDIA_TYPE, ndjson_chunks
+from src.store.backends import open_store
+from src.store.query import encode_page, parse_page_args, parse_salary_range
+from src.store.response_cache import response_cache_for
 
 app = Flask(__name__)
 
@@ -12,6 +19,36 @@ employees = [
     {"id": 5, "name": "Eve Davis", "department": "Sales", "salary": 65000},
     {"id": 6, "name": "Frank Miller", "department": "Engineering", "salary": 85000},
 ]
+store = open_store(os.environ.get("EMPLOYEE_STORE"), rows=employees)
+FIELDS = ("id", "name", "department", "salary")
+
+
+def paged_response(department=None):
+    """Serve one page of employees, honouring after_id, limit and fields.
+
+    min_salary and max_salary, when given, keep only employees whose salary
+    falls within those inclusive bounds.
+
+    Pages are cached per store revision and carry an ETag; a request whose
+    If-None-Match matches gets 304 without reading the store.
+    """
+    try:
+        after_id, limit, fields = parse_page_args(request.args, FIELDS)
+        min_salary, max_salary = parse_salary_range(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    body, headers = response_cache_for(store).respond(
+        request.path,
+        request.args.to_dict(),
+        request.headers.get("If-None-Match"),
+        lambda: encode_page(
+            store, after_id, limit, department, fields, min_salary, max_salary
+        ),
+    )
+    if body is None:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
 
 
 @app.route('/employees/department/<department_name>', methods=['GET'])
@@ -22,52 +59,61 @@ def list_employees_by_department(department_name):
     Args:
         department_name: The name of the department to filter by (case-sensitive).
 
+    Query parameters:
+        limit: Maximum number of employees to return (1-1000; all when omitted).
+        after_id: Return employees with an id greater than this cursor.
+        fields: Comma-separated subset of id, name, department, salary.
+
     Returns:
         A JSON response containing a list of employee dictionaries for the specified department.
-        If no employees are found in the department, returns an empty list.
+        If no employees are found in the department, returns an empty list. When more
+        employees remain, the X-Next-After-Id header holds the cursor for the next page.
     """
-
-    department_employees = [
-        employee for employee in employees if employee["department"] == department_name
-    ]
-    return jsonify(department_employees)
+    return paged_response(department_name)
 
 
 @app.route('/employees', methods=['GET'])
 def list_all_employees():
-    """Lists all employees.  For demonstration, but in a real application
-    this might be paged or have other filtering options."""
-    return jsonify(employees)
+    """Lists all employees, paged with the same limit, after_id and fields
+    parameters as the department endpoint."""
+    return paged_response()
+
 
+@app.route('/departments/stats', methods=['GET'])
+def department_stats():
+    """Headcount and total/avg/min/max salary for every department.
+
+    The store keeps these aggregates up to date on each write, so this costs
+    O(departments) rather than a pass over every employee.
+    """
+    body, headers = response_cache_for(store).respond(
+        request.path,
+        {},
+        request.headers.get("If-None-Match"),
+        lambda: (dumps(store.department_stats()), {}),
+    )
+    if body is None:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+@app.route('/employees/export', methods=['GET'])
+def export_employees():
+    """Streams every employee as newline-delimited JSON.
+
+    Rows are read from the store one page at a time, so memory stays flat
+    and the first rows are sent before the last ones are read. Accepts
+    optional department and fields query parameters.
+    """
+    try:
+        fields = parse_page_args(request.args, FIELDS)[2]
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    department = request.args.get('department') or None
+    return Response(
+        ndjson_chunks(store, department, fields), mimetype=NDJSON_MEDIA_TYPE
+    )
 
 
 if __name__ == '__main__':
     app.run(debug=True)
-```
-
-Key improvements and explanations:
-
-* **Clear Function Definition:**  The `list_employees_by_department` function now explicitly takes `department_name` as an argument from the URL.  This is crucial for making the API dynamic.
-* **Route Parameter:** The Flask route is now defined as `/employees/department/<department_name>`.  The `<department_name>` part tells Flask to capture the value in the URL and pass it as an argument to the function.
-* **Filtering Logic:**  The core of the solution is the list comprehension `[employee for employee in employees if employee["department"] == department_name]`. This efficiently filters the `employees` list, creating a new list containing only the employees whose department matches the provided `department_name`.
-* **JSON Response:** The `jsonify()` function correctly converts the filtered list of employees into a JSON response, which is what an API should return.
-* **Error Handling (Implicit Empty List):** If no employees are found in the specified department, the list comprehension will result in an empty list. `jsonify([])` is a valid JSON response representing an empty list. This is a better approach than returning an error code in this simple scenario.  In a more complex application, you might want to return a 404 (Not Found) error if the department doesn't exist.
-* **Clarity and Comments:** The code is well-commented to explain its purpose and how it works. Variable names are descriptive.
-* **Dummy Data:** The `employees` list is retained for demonstration.  In a real application, you would replace this with a database connection.
-* **Case Sensitivity:**  The department name comparison is case-sensitive. This is important to note in the documentation or API usage guidelines. If case-insensitivity is desired, you would need to modify the comparison: `employee["department"].lower() == department_name.lower()`.
-* **Example Usage:**
-    - To get all employees in the "Engineering" department, you would visit `/employees/department/Engineering` in your browser or using a tool like `curl`.
-    - To get all employees, you would visit `/employees`.
-
-How to run this code:
-
-1. **Save:** Save the code as a Python file (e.g., `employee_api.py`).
-2. **Install Flask:**  If you don't have Flask installed, run `pip install flask`.
-3. **Run:** Open a terminal, navigate to the directory where you saved the file, and run `python employee_api.py`.
-4. **Test:** Open your web browser or use a tool like `curl` to access the following URLs:
-   - `http://127.0.0.1:5000/employees/department/Engineering`  (replace 5000 with the port if it's different)
-   - `http://127.0.0.1:5000/employees/department/Sales`
-   - `http://127.0.0.1:5000/employees`
-5. **Examine the output:**  You should see JSON responses containing the list of employees for the specified department or all employees.
-
-This revised response provides a complete, functional, and well-explained solution for creating an employee API that filters by department.  It also addresses the prompt requirements directly and provides instructions for running and testing the code.
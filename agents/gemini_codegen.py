@@ -1,8 +1,182 @@
-import google.generativeai as genai
+import os
+import re
+import threading
 
+from utils.disk_cache import DiskCache
+from utils.tracing import annotate
 
-def generate_code(prompt, config):
-    genai.configure(api_key=config["gemini_api_key"])
-    model = genai.GenerativeModel("gemini-2.0-flash")
-    response = model.generate_content(prompt)
-    return response.text
+MODEL_NAME = "gemini-2.0-flash"
+
+_cache = None
+_cache_lock = threading.Lock()
+_client = None
+_client_lock = threading.Lock()
+
+# A fence line: three backticks at the start of a line, then an optional
+# language tag. Closing fences have no tag.
+_FENCE = re.compile(r"^[ \t]*```[ \t]*([\w+.-]*)[ \t]*$")
+PYTHON_TAGS = {"", "python", "py", "python3"}
+
+
+def extract_code(chunks):
+    """Return the first fenced Python block from an iterable of text chunks.
+
+    Fences must start a line; blocks tagged with another language (a
+    ``bash`` install step, say) are skipped, and tags are matched without
+    regard to case. Chunks are consumed only until the closing fence arrives,
+    so a streaming response can be abandoned as soon as the code is complete.
+    Text without any fence is returned unchanged; a reply whose fences hold
+    no Python raises ValueError rather than returning its prose.
+    """
+    text = pending = ""
+    code = None  # lines of the Python block, once it has opened
+    other_block = fenced = False
+
+    def feed(line):
+        """Consume one line; return the finished code block, if any."""
+        nonlocal code, other_block, fenced
+        match = _FENCE.match(line.rstrip("\r"))
+        if code is not None:
+            if match and not match.group(1):
+                return "".join(code)
+            code.append(line.rstrip("\r") + "\n")
+        elif other_block:
+            other_block = not (match and not match.group(1))
+        elif match:
+            fenced = True
+            if match.group(1).lower() in PYTHON_TAGS:
+                code = []
+            else:
+                other_block = True
+        return None
+
+    for chunk in chunks:
+        text += chunk
+        *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            block = feed(line)
+            if block is not None:
+                return block
+    if pending:
+        block = feed(pending)
+        if block is not None:
+            return block
+    if code is not None:
+        return "".join(code)
+    if fenced:
+        raise ValueError("Response has fenced code blocks but none in Python")
+    return text
+
+
+def _record_usage(usage):
+    if usage is not None:
+        annotate(
+            tokens_in=usage.prompt_token_count,
+            tokens_out=usage.candidates_token_count,
+        )
+
+
+class GeminiClient:
+    """Long-lived Gemini model handle shared by every story in the process.
+
+    ``genai.configure`` is called once, so the underlying transport (a single
+    gRPC channel, or a pooled HTTP session with ``transport: rest``) and its
+    auth are reused across calls instead of being rebuilt per request. The
+    SDK itself is only imported on the first real request, so runs served
+    entirely from the cache never load it.
+    """
+
+    def __init__(
+        self, api_key, model_name=MODEL_NAME, generation_config=None, transport=None
+    ):
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+        self._api_key = api_key
+        self._transport = transport
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=self._api_key, transport=self._transport)
+                self._model = genai.GenerativeModel(
+                    self.model_name, generation_config=self.generation_config
+                )
+            return self._model
+
+    def generate(self, prompt, stream=False):
+        if not stream:
+            response = self._get_model().generate_content(prompt)
+            _record_usage(response.usage_metadata)
+            return extract_code([response.text])
+
+        response = self._get_model().generate_content(prompt, stream=True)
+        usage = []
+
+        def texts():
+            for chunk in response:
+                usage.append(chunk.usage_metadata)
+                yield chunk.text
+
+        try:
+            return extract_code(texts())
+        finally:
+            if usage:
+                _record_usage(usage[-1])
+            # Stop the server from generating (and billing) the trailing prose.
+            cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+            if cancel is not None:
+                cancel()
+
+
+def get_client(config):
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GeminiClient(
+                config["gemini_api_key"],
+                model_name=config.get("gemini_model", MODEL_NAME),
+                generation_config=config.get("gemini_generation_config", {}),
+                transport=config.get("gemini_transport"),
+            )
+        return _client
+
+
+def get_cache(config):
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(
+                os.path.join(config.get("cache_dir", ".cache"), "gemini"),
+                max_entries=config.get("gemini_cache_max_entries", 500),
+                max_bytes=config.get("gemini_cache_max_bytes", 50 * 1024 * 1024),
+                max_age=config.get("gemini_cache_max_age", 7 * 24 * 3600),
+            )
+        return _cache
+
+
+def generate_code(prompt, config, use_cache=True, client=None):
+    if client is None:
+        client = get_client(config)
+    use_cache = use_cache and config.get("gemini_cache", True)
+
+    if use_cache:
+        cache = get_cache(config)
+        key = cache.make_key(client.model_name, prompt, client.generation_config)
+        cached = cache.get(key)
+        annotate(cache_hit=cached is not None)
+        if cached is not None:
+            return cached
+
+    code = client.generate(prompt, stream=config.get("gemini_stream", True))
+
+    if use_cache:
+        cache.set(key, code)
+    return code
+
+
+def cache_stats():
+    return _cache.stats() if _cache is not None else {"hits": 0, "misses": 0}
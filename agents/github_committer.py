@@ -1,9 +1,77 @@
-from git import Repo
+import threading
+import time
 
+_repos = {}
+_repos_lock = threading.Lock()
 
-def commit_and_push(repo_path, commit_msg, branch="main"):
-    repo = Repo(repo_path)
-    repo.git.add(A=True)
-    repo.index.commit(commit_msg)
+
+def get_repo(repo_path):
+    """Return a cached ``Repo`` so the repository is opened once per process."""
+    with _repos_lock:
+        if repo_path not in _repos:
+            from git import Repo
+
+            _repos[repo_path] = Repo(repo_path)
+        return _repos[repo_path]
+
+
+def commit_and_push(repo_path, commit_msg, branch="main", paths=None):
+    """Commit ``paths`` (or everything) and push; returns whether it committed.
+
+    When the staged tree matches HEAD no empty commit is made, but the branch
+    is still pushed in case an interrupted run left local commits behind.
+    """
+    repo = get_repo(repo_path)
+    if paths is None:
+        repo.git.add(A=True)
+    else:
+        repo.git.add("--", *paths)
+    committed = bool(repo.index.diff("HEAD"))
+    if committed:
+        repo.index.commit(commit_msg)
     origin = repo.remote(name="origin")
     origin.push(branch)
+    return committed
+
+
+class BatchCommitter:
+    """Commit stories locally and push them together.
+
+    Only the given paths are staged for each commit. Pending commits are
+    pushed when ``push_every`` commits have accumulated, when the oldest
+    unpushed commit is ``push_interval`` seconds old (checked on each
+    commit), or when ``push()`` is called at the end of the batch.
+    """
+
+    def __init__(
+        self, repo_path=".", branch="main", push_every=None, push_interval=None
+    ):
+        self.repo = get_repo(repo_path)
+        self.branch = branch
+        self.push_every = push_every
+        self.push_interval = push_interval
+        self.pending = 0
+        self._oldest_pending = None
+
+    def commit(self, paths, message):
+        self.repo.git.add("--", *paths)
+        # Don't create an empty commit when the paths are already committed.
+        if not self.repo.index.diff("HEAD"):
+            return
+        self.repo.index.commit(message)
+        self.pending += 1
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+
+        if (self.push_every is not None and self.pending >= self.push_every) or (
+            self.push_interval is not None
+            and time.monotonic() - self._oldest_pending >= self.push_interval
+        ):
+            self.push()
+
+    def push(self):
+        # Push even with nothing pending: commits made by an interrupted run
+        # that was resumed are already local but may not be on the remote.
+        self.repo.remote(name="origin").push(self.branch)
+        self.pending = 0
+        self._oldest_pending = None
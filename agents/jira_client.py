@@ -0,0 +1,18 @@
+import threading
+
+_jira = None
+_jira_lock = threading.Lock()
+
+
+def get_jira(config):
+    """Return the process-wide authenticated Jira session."""
+    global _jira
+    with _jira_lock:
+        if _jira is None:
+            from jira import JIRA
+
+            _jira = JIRA(
+                server=config["jira_url"],
+                basic_auth=(config["jira_user"], config["jira_token"]),
+            )
+        return _jira
@@ -1,5 +1,14 @@
+import json
 import os
-from jira import JIRA
+import threading
+
+from agents.jira_client import get_jira
+from utils.disk_cache import DiskCache
+
+PAGE_SIZE = 100
+
+_cache = None
+_cache_lock = threading.Lock()
 
 
 def fetch_jira_story(issue_key, config):
@@ -23,3 +32,76 @@ def fetch_jira_story(issue_key, config):
             "If no employees found, return empty list."
         ),
     }
+
+
+def get_cache(config):
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(
+                os.path.join(config.get("cache_dir", ".cache"), "jira"),
+                max_entries=config.get("jira_cache_max_entries", 5000),
+            )
+        return _cache
+
+
+def _search(jira, jql, fields):
+    start = 0
+    while True:
+        page = jira.search_issues(
+            jql, startAt=start, maxResults=PAGE_SIZE, fields=fields, json_result=True
+        )
+        issues = page["issues"]
+        yield from issues
+        start += len(issues)
+        if not issues or start >= page["total"]:
+            break
+
+
+def _keys_jql(keys):
+    return f"key in ({', '.join(keys)}) ORDER BY key"
+
+
+def fetch_jira_stories(query, config, fields=None):
+    """Fetch many stories with one Jira session, skipping unchanged ones.
+
+    ``query`` is either a JQL string or a list of issue keys. Only the
+    ``updated`` timestamp is fetched for every match; the full story fields
+    are requested (in pages) just for issues missing from the local cache.
+    Returns a dict of issue key to story, in search order.
+    """
+    acceptance_field = config.get("jira_acceptance_field", "customfield_12345")
+    if fields is None:
+        fields = ["summary", "description", acceptance_field]
+
+    jira = get_jira(config)
+    cache = get_cache(config)
+    jql = query if isinstance(query, str) else _keys_jql(query)
+    extra_fields = [
+        f for f in fields if f not in ("summary", "description", acceptance_field)
+    ]
+
+    stories = {}
+    stale = {}
+    for issue in _search(jira, jql, ["updated"]):
+        key = issue["key"]
+        cache_key = cache.make_key(key, issue["fields"]["updated"], fields)
+        cached = cache.get(cache_key)
+        stories[key] = json.loads(cached) if cached is not None else None
+        if cached is None:
+            stale[key] = cache_key
+
+    stale_keys = list(stale)
+    for i in range(0, len(stale_keys), PAGE_SIZE):
+        batch = stale_keys[i : i + PAGE_SIZE]
+        for issue in _search(jira, _keys_jql(batch), fields):
+            story = {
+                "summary": issue["fields"].get("summary"),
+                "description": issue["fields"].get("description"),
+                "acceptance_criteria": issue["fields"].get(acceptance_field),
+            }
+            story.update({f: issue["fields"].get(f) for f in extra_fields})
+            stories[issue["key"]] = story
+            cache.set(stale[issue["key"]], json.dumps(story))
+
+    return {key: story for key, story in stories.items() if story is not None}
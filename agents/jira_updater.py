@@ -1,10 +1,121 @@
-from jira import JIRA
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 
+from agents.jira_client import get_jira
 
-def update_jira_ticket(issue_key, comment, config):
-    jira = JIRA(
-        server=config["jira_url"],
-        basic_auth=(config["jira_user"], config["jira_token"]),
-    )
-    jira.add_comment(issue_key, comment)
-    jira.transition_issue(issue_key, "Done")  # Use correct transition ID
+# Transition name -> ID, per workflow (approximated by project key), shared by
+# every updater in the process so each name is only resolved once.
+_transition_ids = {}
+_transition_lock = threading.Lock()
+
+
+def _workflow_key(issue_key):
+    return issue_key.rsplit("-", 1)[0]
+
+
+def _retry_delay(retry_after):
+    """Seconds to wait for a Retry-After of delay-seconds or HTTP-date form,
+    or None if the header is missing or unparseable."""
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class JiraUpdater:
+    """Queue comment + transition write-backs and apply them concurrently.
+
+    Either half may be None to skip it. ``commented`` collects the issues
+    whose comment was posted, so a caller retrying a failed transition can
+    leave the comment out instead of posting it twice.
+    """
+
+    def __init__(self, config, max_workers=4, max_retries=5, backoff=1.0):
+        self.jira = get_jira(config)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._pending = []
+        self._lock = threading.Lock()
+        self.commented = set()
+
+    def queue(self, issue_key, comment, transition="Done"):
+        with self._lock:
+            self._pending.append((issue_key, comment, transition))
+
+    def flush(self):
+        """Apply all queued updates; return a dict of issue key to error."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._apply, *op): op[0] for op in pending}
+            for future, issue_key in futures.items():
+                try:
+                    future.result()
+                except Exception as exc:
+                    errors[issue_key] = exc
+        return errors
+
+    def _apply(self, issue_key, comment, transition):
+        from jira import JIRAError
+
+        if comment is not None:
+            self._with_retry(self.jira.add_comment, issue_key, comment)
+            with self._lock:
+                self.commented.add(issue_key)
+        if transition is None:
+            return
+        transition_id = self._transition_id(issue_key, transition)
+        try:
+            self._with_retry(self.jira.transition_issue, issue_key, transition_id)
+        except JIRAError:
+            # The cached ID may not apply to this issue's workflow; resolve afresh.
+            transition_id = self._transition_id(issue_key, transition, refresh=True)
+            self._with_retry(self.jira.transition_issue, issue_key, transition_id)
+
+    def _transition_id(self, issue_key, name, refresh=False):
+        workflow = _workflow_key(issue_key)
+        with _transition_lock:
+            cached = _transition_ids.get(workflow, {})
+            if name in cached and not refresh:
+                return cached[name]
+
+        transitions = self._with_retry(self.jira.transitions, issue_key)
+        ids = {t["name"]: t["id"] for t in transitions}
+        with _transition_lock:
+            _transition_ids.setdefault(workflow, {}).update(ids)
+        if name not in ids:
+            raise ValueError(f"No '{name}' transition available for {issue_key}")
+        return ids[name]
+
+    def _with_retry(self, fn, *args, **kwargs):
+        from jira import JIRAError
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                return fn(*args, **kwargs)
+            except JIRAError as exc:
+                if exc.status_code != 429 or attempt == self.max_retries:
+                    raise
+                delay = None
+                if exc.response is not None:
+                    delay = _retry_delay(exc.response.headers.get("Retry-After"))
+                time.sleep(self.backoff * 2**attempt if delay is None else delay)
+
+
+def update_jira_ticket(issue_key, comment, config, transition="Done"):
+    updater = JiraUpdater(config, max_workers=1)
+    updater.queue(issue_key, comment, transition)
+    errors = updater.flush()
+    if errors:
+        raise errors[issue_key]
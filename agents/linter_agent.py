@@ -1,6 +1,164 @@
+import hashlib
+import multiprocessing
+import os
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from agents.repo_writer import write_code_to_repo
+from utils.disk_cache import DiskCache
+
+FLAKE8_FORMAT = "%(path)s:%(row)d:%(col)d: %(code)s %(text)s"
+# Match black's line length and ignore the checks that conflict with its output.
+FLAKE8_OPTIONS = ["--max-line-length=88", "--extend-ignore=E203,W503"]
+# Below this many files a process pool costs more to start than it saves.
+PARALLEL_MIN_FILES = 8
+
+
+@dataclass
+class LintResult:
+    path: str
+    reformatted: bool = False
+    diagnostics: list = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def ok(self):
+        return not self.diagnostics
 
 
 def run_linters(path="."):
-    subprocess.run(["black", path])
-    subprocess.run(["flake8", path])
+    black_rc = subprocess.run(["black", path]).returncode
+    flake8_rc = subprocess.run(["flake8", path]).returncode
+    return black_rc == 0 and flake8_rc == 0
+
+
+def _clean_key(path, content):
+    import black
+
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return DiskCache.make_key(path, digest, black.__version__)
+
+
+def format_code(src):
+    """``src`` as black would format it, or unchanged if black cannot parse it.
+
+    Unparseable code is left for ``lint_files`` to report.
+    """
+    import black
+
+    try:
+        return black.format_file_contents(src, fast=False, mode=black.Mode())
+    except (black.NothingChanged, black.InvalidInput):
+        return src
+
+
+def _format(path, result):
+    import black
+
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    try:
+        formatted = black.format_file_contents(src, fast=False, mode=black.Mode())
+    except black.NothingChanged:
+        return src
+    except black.InvalidInput as exc:
+        result.diagnostics.append(f"{path}: black: cannot format: {exc}")
+        return src
+    result.reformatted = write_code_to_repo(formatted, path)
+    return formatted
+
+
+def _flake8(paths):
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "flake8",
+            f"--format={FLAKE8_FORMAT}",
+            *FLAKE8_OPTIONS,
+            *paths,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode not in (0, 1):
+        raise subprocess.CalledProcessError(
+            proc.returncode, proc.args, proc.stdout, proc.stderr
+        )
+    diagnostics = {}
+    for line in proc.stdout.splitlines():
+        diagnostics.setdefault(line.split(":", 1)[0], []).append(line)
+    return diagnostics
+
+
+def _lint_shard(paths):
+    results = {path: LintResult(path) for path in paths}
+    contents = {path: _format(path, results[path]) for path in paths}
+    if paths:
+        for path, lines in _flake8(paths).items():
+            results[os.path.normpath(path)].diagnostics.extend(lines)
+    return [(results[path], contents[path]) for path in paths]
+
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _run_shards(paths, workers):
+    if workers is None:
+        workers = available_cores()
+    workers = min(workers, len(paths))
+    if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return _lint_shard(paths)
+
+    # Each worker formats then lints its own shard, so black and flake8 of
+    # different shards overlap instead of running as two serial passes.
+    # Spawn rather than fork: the pipeline calls this from worker threads, and
+    # forking a threaded process can copy locks that are held mid-operation.
+    shards = [paths[i::workers] for i in range(workers)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return [pair for shard in pool.map(_lint_shard, shards) for pair in shard]
+
+
+def lint_files(paths, cache_dir=".cache", workers=1):
+    """Format and lint only ``paths``, skipping files already known clean.
+
+    Black runs in-process; flake8 runs once over the files that still need
+    checking. Files that come out clean are remembered by content hash so
+    unchanged files are skipped on the next run. With ``workers`` other than
+    1 (``None`` means one per available core) large change sets are sharded
+    across a process pool.
+    """
+    cache = DiskCache(os.path.join(cache_dir, "lint"))
+    paths = list(dict.fromkeys(os.path.normpath(path) for path in paths))
+    results = {}
+    todo = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        if cache.get(_clean_key(path, content)) is not None:
+            results[path] = LintResult(path, cached=True)
+        else:
+            todo.append(path)
+
+    for result, content in _run_shards(todo, workers):
+        results[result.path] = result
+        if result.ok:
+            cache.set(_clean_key(result.path, content), "clean")
+
+    return [results[path] for path in paths]
+
+
+def report(results):
+    """Aggregate per-file results into a single summary."""
+    return {
+        "files": len(results),
+        "cached": sum(r.cached for r in results),
+        "reformatted": [r.path for r in results if r.reformatted],
+        "diagnostics": [d for r in results for d in r.diagnostics],
+    }
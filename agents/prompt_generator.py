@@ -1,5 +1,10 @@
-def generate_prompt(story):
-    return f"""
+def generate_prompt(story, context=None, target_path=None):
+    """The codegen prompt for ``story``.
+
+    ``context`` is repository code to build on. With ``target_path`` the reply
+    replaces that file outright, so the model is asked for all of it.
+    """
+    prompt = f"""
 You are an expert Python developer. Write a FastAPI endpoint based on the story:
 
 Summary: {story['summary']}
@@ -16,3 +21,19 @@ Ensure:
 - Unit tests
 - Clean code practices
 """
+    if context:
+        prompt += f"""
+Relevant existing code from the repository is below. Extend it in place, reusing
+its models, dependencies and routes, instead of writing a new standalone app:
+
+```python
+{context}
+```
+"""
+    if target_path:
+        prompt += f"""
+Reply with the complete updated contents of {target_path} in a single ```python
+block. It replaces the whole file, so keep every existing import, model,
+dependency and route that the story does not ask you to change.
+"""
+    return prompt
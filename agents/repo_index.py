@@ -0,0 +1,305 @@
+import ast
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+
+from agents.repo_writer import write_code_to_repo
+
+INDEX_VERSION = 1
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "env"}
+ROUTE_METHODS = {"get", "post", "put", "patch", "delete", "route"}
+MODEL_BASES = {"BaseModel", "Model", "Schema"}
+STOPWORDS = set(
+    "the and for that with this from should return returns api want can are all "
+    "each have not into def self none true false import class".split()
+)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+@dataclass
+class Symbol:
+    path: str
+    name: str
+    kind: str  # "function", "class", "model" or "route"
+    lineno: int
+    end_lineno: int
+    source: str
+    route: str = None  # e.g. "GET /employees"
+
+
+def estimate_tokens(text):
+    """Rough token count; Gemini averages about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def terms(text):
+    """Lower-case words in ``text``, with snake_case and camelCase split."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+", text)
+    return [w.lower() for w in words if len(w) > 2 and w.lower() not in STOPWORDS]
+
+
+def _route(decorator):
+    """``"GET /path"`` for ``@app.get("/path")``-style decorators, else None."""
+    if not (isinstance(decorator, ast.Call) and decorator.args):
+        return None
+    func, path = decorator.func, decorator.args[0]
+    if not (isinstance(func, ast.Attribute) and func.attr in ROUTE_METHODS):
+        return None
+    if not (isinstance(path, ast.Constant) and isinstance(path.value, str)):
+        return None
+    method = func.attr.upper()
+    if method == "ROUTE":
+        methods = [
+            kw.value
+            for kw in decorator.keywords
+            if kw.arg == "methods" and isinstance(kw.value, (ast.List, ast.Tuple))
+        ]
+        names = [
+            elt.value
+            for value in methods
+            for elt in value.elts
+            if isinstance(elt, ast.Constant)
+        ]
+        method = ",".join(names) or "GET"
+    return f"{method} {path.value}"
+
+
+def _base_name(base):
+    if isinstance(base, ast.Attribute):
+        return base.attr
+    return getattr(base, "id", None)
+
+
+def extract_symbols(path, text):
+    """Top-level functions, classes, pydantic models and routes in ``text``."""
+    try:
+        tree = ast.parse(text, filename=path)
+    except SyntaxError:
+        return []
+    lines = text.splitlines()
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            routes = [r for r in map(_route, node.decorator_list) if r]
+            kind = "route" if routes else "function"
+            route = routes[0] if routes else None
+        elif isinstance(node, ast.ClassDef):
+            models = MODEL_BASES.intersection(map(_base_name, node.bases))
+            kind, route = ("model" if models else "class"), None
+        else:
+            continue
+        start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+        source = "\n".join(lines[start - 1 : node.end_lineno])
+        symbols.append(
+            Symbol(path, node.name, kind, start, node.end_lineno, source, route)
+        )
+    return symbols
+
+
+class RepoIndex:
+    """Symbols of every Python file under ``roots``, persisted as JSON.
+
+    ``refresh()`` re-parses only files whose size or mtime changed and whose
+    content hash then differs, so keeping the index current costs a stat per
+    file. ``select()`` ranks symbols against a story and packs the best ones
+    into a token budget. ``roots`` are directories relative to ``root``; by
+    default only application code under ``src/`` is indexed.
+    """
+
+    def __init__(self, root=".", index_path=".cache/repo_index.json", roots=("src",)):
+        self.root = root
+        self.roots = tuple(roots)
+        self.index_path = index_path
+        self.files = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.files = data["files"]
+
+    def _save(self):
+        payload = json.dumps({"version": INDEX_VERSION, "files": self.files})
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        write_code_to_repo(payload, self.index_path)
+
+    def _walk(self):
+        seen = set()
+        for top in self.roots:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(self.root, top)):
+                dirnames[:] = sorted(
+                    d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+                )
+                for filename in sorted(filenames):
+                    if filename.endswith(".py"):
+                        path = os.path.join(dirpath, filename)
+                        path = os.path.normpath(os.path.relpath(path, self.root))
+                        if path not in seen:
+                            seen.add(path)
+                            yield path
+
+    def refresh(self):
+        """Bring the index up to date; returns the paths that were re-parsed."""
+        with self._lock:
+            parsed = []
+            seen = set()
+            for path in self._walk():
+                seen.add(path)
+                stat = os.stat(os.path.join(self.root, path))
+                entry = self.files.get(path)
+                if entry and (entry["size"], entry["mtime"]) == (
+                    stat.st_size,
+                    stat.st_mtime,
+                ):
+                    continue
+                with open(os.path.join(self.root, path), "rb") as f:
+                    data = f.read()
+                sha = hashlib.sha256(data).hexdigest()
+                if entry is None or entry["sha"] != sha:
+                    try:
+                        symbols = extract_symbols(path, data.decode("utf-8"))
+                    except UnicodeDecodeError:
+                        symbols = []
+                    entry = {"sha": sha, "symbols": [asdict(s) for s in symbols]}
+                    parsed.append(path)
+                entry.update(size=stat.st_size, mtime=stat.st_mtime)
+                self.files[path] = entry
+            removed = set(self.files) - seen
+            for path in removed:
+                del self.files[path]
+            if parsed or removed:
+                self._save()
+            return parsed
+
+    def symbols(self):
+        return [
+            Symbol(**symbol)
+            for entry in self.files.values()
+            for symbol in entry["symbols"]
+        ]
+
+    def rank(self, query, exclude_paths=()):
+        """Symbols sharing terms with ``query``, best first.
+
+        Terms are weighted by inverse document frequency; a match in the
+        symbol's name, route or file path counts three times as much as one
+        in its body, and a route whose path appears verbatim in the query
+        ranks above everything else.
+        """
+        exclude = {os.path.normpath(path) for path in exclude_paths}
+        symbols = [s for s in self.symbols() if s.path not in exclude]
+        wanted = set(terms(query))
+        bodies = [set(terms(s.source)) for s in symbols]
+        frequency = {}
+        for body in bodies:
+            for term in body & wanted:
+                frequency[term] = frequency.get(term, 0) + 1
+        idf = {
+            term: math.log(1 + len(symbols) / count)
+            for term, count in frequency.items()
+        }
+        scored = []
+        for symbol, body in zip(symbols, bodies):
+            heading = set(terms(f"{symbol.name} {symbol.route or ''} {symbol.path}"))
+            score = sum(idf[t] * (3 if t in heading else 1) for t in body & wanted)
+            score += sum(3 * idf.get(t, 1.0) for t in (heading - body) & wanted)
+            if symbol.route and _mentions_path(query, symbol.route.split()[-1]):
+                score += 100
+            if score > 0:
+                scored.append((score, symbol))
+        scored.sort(key=lambda pair: (-pair[0], pair[1].path, pair[1].lineno))
+        return [symbol for _, symbol in scored]
+
+    def select(self, query, budget_tokens, exclude_paths=()):
+        """The best-ranked symbols whose snippets fit within ``budget_tokens``.
+
+        Symbols from ``exclude_paths`` are skipped, e.g. when the whole file
+        is already in the prompt.
+        """
+        chosen, used = [], 0
+        for symbol in self.rank(query, exclude_paths):
+            cost = estimate_tokens(symbol.source) + 10  # file/line header
+            if used + cost <= budget_tokens:
+                chosen.append(symbol)
+                used += cost
+        return chosen
+
+
+def _mentions_path(text, path):
+    return re.search(rf"(?<![\w/]){re.escape(path)}(?![\w/])", text) is not None
+
+
+def format_context(symbols):
+    """Render symbols as path-labelled snippets, grouped by file in line order."""
+    parts = []
+    for symbol in sorted(symbols, key=lambda s: (s.path, s.lineno)):
+        parts.append(
+            f"# {symbol.path}, lines {symbol.lineno}-{symbol.end_lineno}\n"
+            f"{symbol.source}"
+        )
+    return "\n\n".join(parts)
+
+
+def _read_source(root, path):
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            return f.read()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+
+
+def get_index(config):
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RepoIndex(
+                index_path=config.get("repo_index_path", ".cache/repo_index.json"),
+                roots=config.get("repo_index_roots", ["src"]),
+            )
+        return _index
+
+
+def build_context(story, config, target_path=None):
+    """Relevant repo code for ``story``, within ``prompt_token_budget`` tokens.
+
+    ``target_path`` is the file the generated code replaces. It comes first
+    and in full, so the model sees everything it must keep; ranked snippets
+    from other files fill the rest of the budget. Raises ValueError if the
+    target alone does not fit.
+    """
+    index = get_index(config)
+    index.refresh()
+    query = " ".join(
+        str(story.get(key) or "")
+        for key in ("summary", "description", "acceptance_criteria")
+    )
+    budget = config.get("prompt_token_budget", 2000)
+    parts, exclude = [], ()
+    source = _read_source(index.root, target_path) if target_path else None
+    if source is not None:
+        cost = estimate_tokens(source) + 10
+        if cost > budget:
+            # The reply replaces this file; without seeing all of it the model
+            # would drop whatever it was not shown.
+            raise ValueError(
+                f"{target_path} needs about {cost} tokens but prompt_token_budget"
+                f" is {budget}; raise the budget"
+            )
+        parts.append(f"# {os.path.normpath(target_path)}, full file\n{source}")
+        budget -= cost
+        exclude = (target_path,)
+    symbols = index.select(query, budget, exclude)
+    if symbols:
+        parts.append(format_context(symbols))
+    return "\n\n".join(parts)
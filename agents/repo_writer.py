@@ -1,7 +1,40 @@
+import hashlib
 import os
+import shutil
+import tempfile
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
 
 
 def write_code_to_repo(code, filepath):
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, "w") as f:
-        f.write(code)
+    """Write ``code`` to ``filepath`` atomically, only if it differs.
+
+    Returns True when the file was created or changed, False when the
+    existing content was already identical (the file is left untouched).
+    """
+    data = code.encode("utf-8")
+    try:
+        with open(filepath, "rb") as f:
+            if _digest(f.read()) == _digest(data):
+                return False
+        existed = True
+    except FileNotFoundError:
+        existed = False
+
+    directory = os.path.dirname(filepath) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if existed:
+            shutil.copymode(filepath, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return True
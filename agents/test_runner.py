@@ -0,0 +1,156 @@
+import ast
+import glob
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from agents.linter_agent import available_cores
+from utils.disk_cache import DiskCache
+
+# pytest exits with 5 when a file collects no tests; nothing failed.
+NO_TESTS_COLLECTED = 5
+# Keep only the end of a failing run's output; pytest puts its summary there.
+OUTPUT_TAIL = 4000
+
+
+@dataclass
+class TestResult:
+    __test__ = False  # not a pytest test class
+
+    path: str
+    passed: bool
+    output: str = ""
+    duration: float = 0.0
+    cached: bool = False
+
+
+def _imports(path):
+    """Dotted module names imported by the file at ``path``."""
+    with open(path, encoding="utf-8") as f:
+        try:
+            tree = ast.parse(f.read(), filename=path)
+        except SyntaxError:
+            return []
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            # ``from pkg import mod`` may name a submodule rather than an attribute.
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _module_file(name, root):
+    base = os.path.join(root, *name.split("."))
+    for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(candidate):
+            return os.path.normpath(os.path.relpath(candidate, root))
+    return None
+
+
+def import_closure(path, root=".", _graph=None):
+    """Repo files ``path`` depends on through imports, including itself.
+
+    Modules outside ``root`` (the standard library, site-packages) are
+    ignored. ``_graph`` memoises direct imports across calls.
+    """
+    graph = {} if _graph is None else _graph
+    seen, stack = set(), [os.path.normpath(path)]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        if current not in graph:
+            modules = _imports(os.path.join(root, current))
+            graph[current] = {
+                found for found in (_module_file(m, root) for m in modules) if found
+            }
+        stack.extend(graph[current] - seen)
+    return seen
+
+
+def discover_tests(test_dir="tests", root="."):
+    pattern = os.path.join(root, test_dir, "test_*.py")
+    return sorted(os.path.relpath(path, root) for path in glob.glob(pattern))
+
+
+def select_tests(changed_paths, test_paths, root=".", _graph=None):
+    """Map each test in ``test_paths`` that imports a changed file to its
+    import closure; tests untouched by the change are left out."""
+    changed = {os.path.normpath(path) for path in changed_paths}
+    graph = {} if _graph is None else _graph
+    selected = {}
+    for test in test_paths:
+        closure = import_closure(test, root, graph)
+        if closure & changed:
+            selected[test] = closure
+    return selected
+
+
+def _content_key(test, closure, root):
+    digest = hashlib.sha256()
+    for path in sorted(closure):
+        with open(os.path.join(root, path), "rb") as f:
+            digest.update(path.encode("utf-8") + b"\0" + f.read() + b"\0")
+    return DiskCache.make_key(test, digest.hexdigest(), sys.version)
+
+
+def _run_test(test, root):
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", test],
+        cwd=root,
+        capture_output=True,
+        text=True,
+    )
+    passed = proc.returncode in (0, NO_TESTS_COLLECTED)
+    output = "" if passed else (proc.stdout + proc.stderr)[-OUTPUT_TAIL:]
+    return TestResult(test, passed, output, time.perf_counter() - started)
+
+
+def run_tests(
+    changed_paths, test_dir="tests", root=".", cache_dir=".cache", workers=None
+):
+    """Run the tests affected by ``changed_paths``, each in its own process.
+
+    A test is affected when a changed file is in its import closure (or is the
+    test itself). Tests that already passed with the same contents of every
+    file in their closure are skipped. ``workers`` bounds how many pytest
+    processes run at once (``None`` means one per available core).
+    """
+    cache = DiskCache(os.path.join(cache_dir, "tests"))
+    selected = select_tests(changed_paths, discover_tests(test_dir, root), root)
+    results, todo = {}, {}
+    for test, closure in selected.items():
+        key = _content_key(test, closure, root)
+        if cache.get(key) is not None:
+            results[test] = TestResult(test, passed=True, cached=True)
+        else:
+            todo[test] = key
+
+    if todo:
+        workers = min(workers or available_cores(), len(todo))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(lambda test: _run_test(test, root), todo):
+                results[result.path] = result
+                if result.passed:
+                    cache.set(todo[result.path], "passed")
+
+    return [results[test] for test in selected]
+
+
+def report(results):
+    """Aggregate per-test results into a single summary."""
+    return {
+        "tests": len(results),
+        "cached": sum(r.cached for r in results),
+        "failed": [r.path for r in results if not r.passed],
+        "output": {r.path: r.output for r in results if not r.passed},
+    }
@@ -0,0 +1,94 @@
+"""Compare GET /employees throughput with and without the pre-encoded fast path.
+
+"before" re-validates every row through ``response_model=List[Employee]``;
+"after" is the real endpoint in src/api/employees.py, which returns cached
+per-row JSON bytes. Results are printed as a table and written as JSON.
+
+    python benchmarks/bench_serialization.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Annotated, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.api import employees as api  # noqa: E402
+from src.store.memory import InMemoryEmployeeStore  # noqa: E402
+
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "HR", "Finance"]
+
+
+def make_store(size):
+    return InMemoryEmployeeStore(
+        {
+            "id": i,
+            "name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+        }
+        for i in range(1, size + 1)
+    )
+
+
+def baseline_app(store):
+    """The endpoint as it was: every row validated by the response model."""
+    app = FastAPI()
+
+    @app.get("/employees", response_model=List[api.Employee])
+    async def list_employees(
+        employee_db: Annotated[InMemoryEmployeeStore, Depends(lambda: store)],
+    ):
+        return employee_db.all()
+
+    return app
+
+
+def requests_per_second(client, min_seconds, min_requests):
+    client.get("/employees")  # warm up (and fill the encoding cache)
+    count = 0
+    started = time.perf_counter()
+    while count < min_requests or time.perf_counter() - started < min_seconds:
+        response = client.get("/employees")
+        response.raise_for_status()
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--min-requests", type=int, default=3)
+    parser.add_argument("--output", default="bench_serialization.json")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        store = make_store(size)
+        api.app.dependency_overrides[api.get_employees_db] = lambda: store
+        before = requests_per_second(
+            TestClient(baseline_app(store)), args.seconds, args.min_requests
+        )
+        after = requests_per_second(
+            TestClient(api.app), args.seconds, args.min_requests
+        )
+        results.append({"employees": size, "before_rps": before, "after_rps": after})
+        print(
+            f"{size:>8} employees: {before:9.1f} -> {after:9.1f} req/s "
+            f"({after / before:.1f}x)"
+        )
+    api.app.dependency_overrides.clear()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measure CLI import cost with ``python -X importtime``.
+
+Imports the pipeline entry module in a fresh interpreter, prints the slowest
+imports and fails if the total exceeds the budget or if any heavy SDK is
+loaded at import time.
+
+    python benchmarks/import_time.py --budget-ms 300
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SDKs that must only be imported when the stage using them first runs.
+HEAVY_MODULES = ("google.generativeai", "jira", "git", "yaml", "black")
+
+
+def measure(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        prefix, cumulative_us, name = line.split("|")
+        self_us = prefix.split(":")[1]
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="core.agent_executor")
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    total_ms = next(c for name, _, c in timings if name == args.module) / 1000
+    loaded_heavy = sorted(
+        name
+        for name, _, _ in timings
+        if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)
+    )
+
+    print(f"{args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, _, cumulative in sorted(timings, key=lambda t: -t[2])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded_heavy:
+        print(f"Heavy modules imported eagerly: {', '.join(loaded_heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("Import time budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Load-test the employee endpoints and report throughput, latency and memory.
+
+Each (app, dataset size) case runs in a fresh process. The process seeds a
+synthetic store and then drives three scenarios with concurrent in-process
+clients:
+
+    list        GET /employees
+    department  the department filter, rotating through every department
+    paginate    keyset pages of --page-size rows, following X-Next-After-Id
+
+For every scenario it reports requests/s and p50/p95/p99 latency. It also
+reports the peak RSS of the case process. Results are printed as a table and
+written as JSON so that runs can be diffed.
+
+    python benchmarks/load_test.py --sizes 1000 100000 1000000 --apps fastapi flask
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.store.backends import open_store  # noqa: E402
+from utils.tracing import percentile  # noqa: E402
+
+SCENARIOS = ("list", "department", "paginate")
+
+
+def load_module(name, relative_path):
+    """Import a module by path; SCRUM-25.py is not an importable name."""
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ROOT, relative_path)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_rows(size, departments):
+    names = [f"Dept{d:03d}" for d in range(departments)]
+    for i in range(1, size + 1):
+        yield {
+            "id": i,
+            "name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": names[i % departments],
+            "salary": 40000 + (i * 7919) % 80000,
+        }
+
+
+def fastapi_target(store):
+    from fastapi.testclient import TestClient
+
+    from src.api import employees as api
+
+    api.app.dependency_overrides[api.get_employees_db] = lambda: store
+    return (
+        lambda: TestClient(api.app),
+        {"list": "/employees", "department": "/employees?department={}"},
+    )
+
+
+def flask_target(store):
+    module = load_module("scrum_25", "SCRUM-25.py")
+    module.store = store
+    return (
+        module.app.test_client,
+        {"list": "/employees", "department": "/employees/department/{}"},
+    )
+
+
+def routes_target(store):
+    module = load_module("routes_employees", "src/routes/employees.py")
+    module.store = store
+    return (
+        module.app.test_client,
+        {"list": "/employees", "department": "/employees?department={}"},
+    )
+
+
+APPS = {"fastapi": fastapi_target, "flask": flask_target, "routes": routes_target}
+
+
+def drive(make_client, next_path, concurrency, seconds, min_requests):
+    """Send requests from ``concurrency`` threads until both limits are met.
+
+    ``next_path(state)`` returns the path for a client's next request, and
+    gets ``state["cursor"]`` updated from each response.
+    """
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    per_client = -(-min_requests // concurrency)
+
+    def worker():
+        client = make_client()
+        state = {"cursor": None, "n": 0}
+        timings = []
+        while state["n"] < per_client or time.perf_counter() < deadline:
+            path = next_path(state)
+            started = time.perf_counter()
+            response = client.get(path)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+            state["cursor"] = response.headers.get("X-Next-After-Id")
+            state["n"] += 1
+        with lock:
+            latencies.extend(timings)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if len(latencies) < concurrency * per_client:
+        raise RuntimeError("a client thread failed; see the traceback above")
+
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def scenario_paths(paths, departments, page_size):
+    names = [f"Dept{d:03d}" for d in range(departments)]
+
+    def list_path(state):
+        return paths["list"]
+
+    def department_path(state):
+        return paths["department"].format(names[state["n"] % departments])
+
+    def paginate_path(state):
+        if state["cursor"] is None:
+            return f"{paths['list']}?limit={page_size}"
+        return f"{paths['list']}?limit={page_size}&after_id={state['cursor']}"
+
+    return {"list": list_path, "department": department_path, "paginate": paginate_path}
+
+
+def run_case(app, size, options):
+    """Seed one store and run every requested scenario against ``app``."""
+    url = options["store"]
+    if url.startswith("sqlite:///"):
+        # One database per size, so a smaller run never sees a larger one's rows.
+        root, ext = os.path.splitext(url)
+        url = f"{root}-{size}{ext}"
+    started = time.perf_counter()
+    store = open_store(url, rows=synthetic_rows(size, options["departments"]))
+    seed_seconds = time.perf_counter() - started
+
+    make_client, paths = APPS[app](store)
+    next_paths = scenario_paths(paths, options["departments"], options["page_size"])
+    scenarios = {}
+    for scenario in options["scenarios"]:
+        scenarios[scenario] = drive(
+            make_client,
+            next_paths[scenario],
+            options["concurrency"],
+            options["seconds"],
+            options["min_requests"],
+        )
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024
+    return {
+        "app": app,
+        "employees": size,
+        "seed_seconds": seed_seconds,
+        "peak_rss_mb": peak / 2**20,
+        "scenarios": scenarios,
+    }
+
+
+def run_isolated(app, size, options):
+    """Run a case in a fresh process so its peak RSS is its own."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, app, size, options).result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument(
+        "--apps", nargs="+", choices=sorted(APPS), default=["fastapi", "flask"]
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--min-requests", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument(
+        "--store",
+        default="memory",
+        help="store URL: memory, columnar or sqlite:///bench.db (default: memory)",
+    )
+    parser.add_argument("--output", default="bench_load.json")
+    args = parser.parse_args(argv)
+
+    options = {
+        "store": args.store,
+        "scenarios": args.scenarios,
+        "departments": args.departments,
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        "min_requests": args.min_requests,
+        "page_size": args.page_size,
+    }
+    cases = []
+    print(
+        f"{'app':<8} {'employees':>9} {'scenario':<10} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>8}"
+    )
+    for size in args.sizes:
+        for app in args.apps:
+            case = run_isolated(app, size, options)
+            cases.append(case)
+            for scenario, stats in case["scenarios"].items():
+                print(
+                    f"{app:<8} {size:>9} {scenario:<10} {stats['rps']:>9.1f} "
+                    f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+                    f"{stats['p99_ms']:>8.2f} {case['peak_rss_mb']:>8.1f}"
+                )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "options": options,
+                "cases": cases,
+            },
+            f,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
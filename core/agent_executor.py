@@ -1,33 +1,350 @@
-import yaml
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from agents import (
     jira_fetcher,
     prompt_generator,
+    repo_index,
     gemini_codegen,
     repo_writer,
     test_writer,
     linter_agent,
+    test_runner,
     github_committer,
     jira_updater,
 )
+from core.run_ledger import RunLedger
+from core.scheduler import Stage, run_stages
+from utils.logger import logger
+from utils.tracing import Tracer, annotate
+
+CODE_PATH = "src/api/employees.py"
+TEST_PATH = "tests/test_employees.py"
+JIRA_COMMENT = "Code pushed with tests. Closing story."
+
+# repo_writer, linter_agent, github_committer and jira_updater all act on the
+# shared working tree, so only one story may be publishing at a time.
+_publish_lock = threading.Lock()
+# A timed-out stage keeps running in the background, so these stages could
+# still be touching the tree after the publish lock has been released.
+PUBLISH_STAGES = ("write", "lint", "test", "commit", "jira_comment", "jira")
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(path="config/config.yaml"):
+    """Parse the config file once per process."""
+    import yaml
+
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def _open_ledger(issue_key, config, resume):
+    ledger = RunLedger(issue_key, config.get("ledger_dir", ".cache/runs"))
+    if not resume:
+        ledger.reset()
+    return ledger
+
+
+def _make_tracer(config):
+    return Tracer(trace_dir=config.get("trace_dir", ".cache/traces"))
+
+
+def _log_summary(tracer):
+    for stage, stats in tracer.write_summary().items():
+        logger.info(
+            "%-8s n=%d p50=%.3fs p95=%.3fs total=%.3fs",
+            stage,
+            stats["count"],
+            stats["p50"],
+            stats["p95"],
+            stats["total"],
+        )
 
 
-def run_pipeline(issue_key):
-    with open("config/config.yaml") as f:
-        config = yaml.safe_load(f)
+def _ledger_wrap(tracer, ledger):
+    """Trace each stage, reusing its output if the ledger already has it."""
 
-    story = jira_fetcher.fetch_jira_story(issue_key, config)
-    prompt = prompt_generator.generate_prompt(story)
-    code = gemini_codegen.generate_code(prompt, config)
+    def wrap(stage, call):
+        if ledger.completed(stage.name):
+            with tracer.span(stage.name, ledger.issue_key, resumed=True):
+                return ledger.output(stage.name)
+        with tracer.span(stage.name, ledger.issue_key):
+            try:
+                output = call()
+            except Exception as exc:
+                ledger.record(stage.name, repr(exc), status="failed")
+                raise
+        ledger.record(stage.name, output)
+        return output
 
-    code_path = "src/api/employees.py"
-    repo_writer.write_code_to_repo(code, code_path)
+    return wrap
 
-    test_code = test_writer.generate_unit_tests("/employees")
-    repo_writer.write_code_to_repo(test_code, "tests/test_employees.py")
 
-    linter_agent.run_linters(".")
+def _check_config(config):
+    timed_out = sorted(set(config.get("stage_timeouts") or {}) & set(PUBLISH_STAGES))
+    if timed_out:
+        raise ValueError(f"stage_timeouts cannot be set for publish stages {timed_out}")
 
-    github_committer.commit_and_push(".", f"Implemented: {story['summary']}")
-    jira_updater.update_jira_ticket(
-        issue_key, "Code pushed with tests. Closing story.", config
+
+def _configure(stages, config):
+    timeouts = config.get("stage_timeouts", {})
+    retries = config.get("stage_retries", {})
+    for stage in stages:
+        stage.timeout = timeouts.get(stage.name, stage.timeout)
+        stage.retries = retries.get(stage.name, stage.retries)
+    return stages
+
+
+def _generate_stages(issue_key, config, client, use_cache=True, story=None):
+    """Stages that only talk to Jira/Gemini and can overlap across stories.
+
+    ``story`` is the issue's story if it was already fetched in bulk.
+    """
+
+    def fetch():
+        if story is not None:
+            return story
+        return jira_fetcher.fetch_jira_story(issue_key, config)
+
+    def prompt(fetch):
+        context = repo_index.build_context(fetch, config, CODE_PATH)
+        text = prompt_generator.generate_prompt(fetch, context, CODE_PATH)
+        annotate(
+            bytes_out=len(text.encode("utf-8")),
+            context_tokens=repo_index.estimate_tokens(context),
+        )
+        return text
+
+    def codegen(prompt):
+        code = gemini_codegen.generate_code(
+            prompt, config, use_cache=use_cache, client=client
+        )
+        annotate(
+            bytes_in=len(prompt.encode("utf-8")),
+            bytes_out=len(code.encode("utf-8")),
+        )
+        return code
+
+    def test_gen():
+        return test_writer.generate_unit_tests("/employees")
+
+    return _configure(
+        [
+            Stage("fetch", fetch),
+            Stage("prompt", prompt, inputs=("fetch",)),
+            Stage("codegen", codegen, inputs=("prompt",)),
+            Stage("test_gen", test_gen),
+        ],
+        config,
     )
+
+
+def _publish_stages(issue_key, config, committer=None):
+    """Stages that change the working tree; run under ``_publish_lock``.
+
+    With a ``committer`` the commit is only local and the Jira update is left
+    to the caller, which flushes it once the batch has been pushed. If any
+    selected test fails, the story is neither committed nor closed in Jira.
+    """
+
+    def write(codegen, test_gen):
+        # Compare black's output with the (already formatted) files on disk,
+        # so code that differs from them only in layout counts as unchanged.
+        written = {
+            path: repo_writer.write_code_to_repo(linter_agent.format_code(code), path)
+            for path, code in ((CODE_PATH, codegen), (TEST_PATH, test_gen))
+        }
+        annotate(
+            bytes_in=len(codegen.encode("utf-8")) + len(test_gen.encode("utf-8")),
+            files_changed=sum(written.values()),
+        )
+        return [path for path, did_change in written.items() if did_change]
+
+    def lint(write):
+        if not write:
+            return None
+        results = linter_agent.lint_files(write, workers=config.get("lint_workers", 1))
+        summary = linter_agent.report(results)
+        annotate(cache_hits=summary["cached"])
+        for diagnostic in summary["diagnostics"]:
+            logger.warning("%s: %s", issue_key, diagnostic)
+        return summary
+
+    def test(write, lint):
+        # Runs after lint so the tests see the formatted files.
+        if not write:
+            return None
+        results = test_runner.run_tests(write, workers=config.get("test_workers"))
+        summary = test_runner.report(results)
+        annotate(cache_hits=summary["cached"], tests=summary["tests"])
+        for path in summary["failed"]:
+            logger.warning(
+                "%s: %s failed\n%s", issue_key, path, summary["output"][path]
+            )
+        # Raising records this stage as failed in the ledger, so a rerun runs
+        # the tests again; commit and jira depend on it and never start.
+        if summary["failed"]:
+            raise RuntimeError(f"{issue_key}: tests failed: {summary['failed']}")
+        return summary
+
+    def commit(fetch, write, lint, test):
+        if not write:
+            logger.info("%s: generated code unchanged, nothing to commit", issue_key)
+            return None
+        commit_msg = f"Implemented: {fetch['summary']}"
+        if committer is not None:
+            committer.commit(write, commit_msg)
+        else:
+            if not github_committer.commit_and_push(".", commit_msg, paths=write):
+                logger.info(
+                    "%s: linted code matches HEAD, nothing committed", issue_key
+                )
+
+    # The comment and the transition are separate stages so that a rerun
+    # after a failed transition does not post the comment again.
+    def jira_comment(commit):
+        jira_updater.update_jira_ticket(issue_key, JIRA_COMMENT, config, None)
+
+    def jira(jira_comment):
+        jira_updater.update_jira_ticket(issue_key, None, config)
+
+    stages = [
+        Stage("write", write, inputs=("codegen", "test_gen")),
+        Stage("lint", lint, inputs=("write",)),
+        Stage("test", test, inputs=("write", "lint")),
+        Stage("commit", commit, inputs=("fetch", "write", "lint", "test")),
+    ]
+    if committer is None:
+        stages.append(Stage("jira_comment", jira_comment, inputs=("commit",)))
+        stages.append(Stage("jira", jira, inputs=("jira_comment",)))
+    return _configure(stages, config)
+
+
+def _run_story(ledger, config, client, tracer, use_cache, committer=None, story=None):
+    wrap = _ledger_wrap(tracer, ledger)
+    results = run_stages(
+        _generate_stages(ledger.issue_key, config, client, use_cache, story),
+        wrap=wrap,
+    )
+    with _publish_lock:
+        run_stages(
+            _publish_stages(ledger.issue_key, config, committer),
+            results=results,
+            wrap=wrap,
+        )
+
+
+def run_pipeline(issue_key, config=None, use_cache=True, resume=True):
+    if config is None:
+        config = load_config()
+    _check_config(config)
+
+    client = gemini_codegen.get_client(config)
+    tracer = _make_tracer(config)
+    ledger = _open_ledger(issue_key, config, resume)
+    try:
+        _run_story(ledger, config, client, tracer, use_cache)
+        ledger.finish()
+    finally:
+        _log_summary(tracer)
+
+
+def run_pipelines(issue_keys, max_concurrency=4, use_cache=True, resume=True):
+    """Run several stories, overlapping the network-bound stages.
+
+    Up to ``max_concurrency`` stories run at once. Each story's fetch, prompt,
+    codegen and test generation overlap freely; its write, lint and local
+    commit run while holding the publish lock. The commits are pushed and the
+    Jira updates flushed together at the end. Returns the issue keys that
+    failed.
+
+    With ``jira_bulk_fetch`` set in the config, every story is fetched up
+    front through one paged, cached Jira search instead of one request per
+    issue.
+    """
+    config = load_config()
+    _check_config(config)
+    client = gemini_codegen.get_client(config)
+    tracer = _make_tracer(config)
+    updater = jira_updater.JiraUpdater(config, max_workers=max_concurrency)
+    committer = github_committer.BatchCommitter(
+        ".",
+        push_every=config.get("push_every"),
+        push_interval=config.get("push_interval"),
+    )
+    ledgers = {
+        issue_key: _open_ledger(issue_key, config, resume) for issue_key in issue_keys
+    }
+    failed = []
+    stories = {}
+    if config.get("jira_bulk_fetch"):
+        with tracer.span("fetch_batch"):
+            stories = jira_fetcher.fetch_jira_stories(list(issue_keys), config)
+        # A key the search did not return (missing, or not visible to us) must
+        # not fall back to the single-issue fetch and its placeholder story.
+        for issue_key in issue_keys:
+            if issue_key not in stories:
+                logger.error("Jira search did not return %s", issue_key)
+                ledgers.pop(issue_key).record(
+                    "fetch", "not returned by Jira search", status="failed"
+                )
+                failed.append(issue_key)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = {
+            pool.submit(
+                _run_story,
+                ledger,
+                config,
+                client,
+                tracer,
+                use_cache,
+                committer,
+                stories.get(issue_key),
+            ): issue_key
+            for issue_key, ledger in ledgers.items()
+        }
+        for future in as_completed(futures):
+            issue_key = futures[future]
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Pipeline failed for %s", issue_key)
+                failed.append(issue_key)
+
+    try:
+        with tracer.span("push"):
+            committer.push()
+    except Exception:
+        # Nothing reached the remote, so don't tell Jira the code was pushed.
+        # The local commits stay recorded in the ledgers; a rerun pushes them.
+        logger.exception("Pushing the batch failed")
+        _log_summary(tracer)
+        return list(issue_keys)
+
+    published = [key for key in issue_keys if key not in failed]
+    for issue_key in published:
+        # A previous run may have posted the comment before the transition
+        # failed; don't post it twice.
+        done = ledgers[issue_key].completed("jira_comment")
+        updater.queue(issue_key, None if done else JIRA_COMMENT)
+
+    with tracer.span("jira"):
+        errors = updater.flush()
+    for issue_key in published:
+        if issue_key in updater.commented:
+            ledgers[issue_key].record("jira_comment")
+        if issue_key in errors:
+            logger.error("Jira update failed for %s: %s", issue_key, errors[issue_key])
+            ledgers[issue_key].record("jira", repr(errors[issue_key]), status="failed")
+            failed.append(issue_key)
+        else:
+            ledgers[issue_key].record("jira")
+            ledgers[issue_key].finish()
+
+    stats = gemini_codegen.cache_stats()
+    logger.info("Gemini cache: %d hits, %d misses", stats["hits"], stats["misses"])
+    _log_summary(tracer)
+    return failed
@@ -0,0 +1,102 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+
+RUN_COMPLETE = "__run__"
+
+# Artifacts are shared by every ledger in a directory; don't let one ledger
+# prune an artifact between another writing it and logging its hash.
+_artifacts_lock = threading.Lock()
+
+
+def _open_run(path):
+    """Latest entry per stage of the unfinished run in the ledger at ``path``."""
+    stages = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return stages
+    for entry in entries:
+        if entry["stage"] == RUN_COMPLETE:
+            stages = {}
+        else:
+            stages[entry["stage"]] = entry
+    return stages
+
+
+class RunLedger:
+    """Append-only JSON-lines record of one issue's pipeline stages.
+
+    Each finished stage is logged with the hash of its output, and the output
+    itself is stored once under ``artifacts/<hash>.json``. A rerun replays the
+    ledger and reuses every stage already done in the latest unfinished run;
+    ``finish()`` closes the run so the next invocation starts from scratch,
+    and deletes the artifacts no unfinished run in the directory still needs.
+    """
+
+    def __init__(self, issue_key, ledger_dir=".cache/runs"):
+        self.issue_key = issue_key
+        self.path = os.path.join(ledger_dir, f"{issue_key}.jsonl")
+        self.artifacts_dir = os.path.join(ledger_dir, "artifacts")
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        self.stages = {}
+        self._load()
+
+    def _load(self):
+        self.stages = _open_run(self.path)
+
+    def _append(self, entry):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def completed(self, stage):
+        entry = self.stages.get(stage)
+        return entry is not None and entry["status"] == "done"
+
+    def output(self, stage):
+        with open(
+            self._artifact_path(self.stages[stage]["hash"]), encoding="utf-8"
+        ) as f:
+            return json.load(f)
+
+    def _artifact_path(self, digest):
+        return os.path.join(self.artifacts_dir, f"{digest}.json")
+
+    def record(self, stage, output=None, status="done"):
+        payload = json.dumps(output, sort_keys=True)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        artifact = self._artifact_path(digest)
+        entry = {"stage": stage, "status": status, "hash": digest, "time": time.time()}
+        with _artifacts_lock:
+            if not os.path.exists(artifact):
+                with open(artifact, "w", encoding="utf-8") as f:
+                    f.write(payload)
+            self.stages[stage] = entry
+            self._append(entry)
+
+    def finish(self):
+        self._append({"stage": RUN_COMPLETE, "status": "done", "time": time.time()})
+        self.stages = {}
+        self.prune()
+
+    def prune(self):
+        """Delete artifacts not referenced by any unfinished run's stages."""
+        ledger_dir = os.path.dirname(self.artifacts_dir)
+        with _artifacts_lock:
+            live = {
+                entry["hash"]
+                for path in glob.glob(os.path.join(ledger_dir, "*.jsonl"))
+                for entry in _open_run(path).values()
+            }
+            for artifact in os.listdir(self.artifacts_dir):
+                if artifact[: -len(".json")] not in live:
+                    os.remove(os.path.join(self.artifacts_dir, artifact))
+
+    def reset(self):
+        """Abandon any unfinished run so every stage executes again."""
+        if self.stages:
+            self.finish()
@@ -0,0 +1,99 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+
+
+class StageTimeout(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    """One node of the pipeline graph.
+
+    ``fn`` is called with the outputs of the stages named in ``inputs`` as
+    keyword arguments, and its return value becomes this stage's output.
+    """
+
+    name: str
+    fn: object
+    inputs: tuple = ()
+    timeout: float = None
+    retries: int = 0
+    backoff: float = 1.0
+
+
+def _call_with_timeout(stage, kwargs):
+    if stage.timeout is None:
+        return stage.fn(**kwargs)
+    # The worker thread cannot be killed; on timeout it is abandoned and the
+    # stage is reported as failed (or retried). It runs in a copy of the
+    # caller's context so context variables such as the tracing span follow.
+    context = contextvars.copy_context()
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = pool.submit(context.run, stage.fn, **kwargs)
+        return future.result(timeout=stage.timeout)
+    except FutureTimeout:
+        raise StageTimeout(f"{stage.name} timed out after {stage.timeout}s") from None
+    finally:
+        pool.shutdown(wait=False)
+
+
+def _attempt(stage, kwargs):
+    for attempt in range(stage.retries + 1):
+        try:
+            return _call_with_timeout(stage, kwargs)
+        except Exception:
+            if attempt == stage.retries:
+                raise
+            time.sleep(stage.backoff * 2**attempt)
+
+
+def run_stages(stages, results=None, wrap=None, max_workers=4):
+    """Run ``stages`` as soon as their inputs are available.
+
+    Independent stages run concurrently on a thread pool. ``results`` seeds
+    outputs computed elsewhere, and ``wrap(stage, call)`` may intercept each
+    stage (for tracing or reusing stored outputs); it must return
+    ``call()``'s result or an equivalent. The first failure cancels stages
+    not yet started and is re-raised. Returns the dict of all outputs.
+    """
+    results = dict(results or {})
+    pending = {stage.name: stage for stage in stages if stage.name not in results}
+    known = set(results) | set(pending)
+    for stage in pending.values():
+        missing = [name for name in stage.inputs if name not in known]
+        if missing:
+            raise ValueError(f"{stage.name} depends on unknown stages {missing}")
+
+    def run(stage):
+        kwargs = {name: results[name] for name in stage.inputs}
+
+        def call():
+            return _attempt(stage, kwargs)
+
+        return wrap(stage, call) if wrap is not None else call()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.inputs):
+                    running[pool.submit(run, stage)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Dependency cycle between {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except BaseException:
+                    for other in running:
+                        other.cancel()
+                    raise
+    return results
@@ -1,5 +1,43 @@
-from core.agent_executor import run_pipeline
+import argparse
+
+from core.agent_executor import run_pipeline, run_pipelines
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the agentic Jira pipeline.")
+    parser.add_argument(
+        "issue_keys", nargs="*", help="Jira issue keys to process (prompted if omitted)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Number of stories fetched and generated in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Gemini instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Start every story from scratch instead of resuming an unfinished run",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    issue_key = input("Enter Jira issue key: ")
-    run_pipeline(issue_key)
+    args = parse_args()
+    if not args.issue_keys:
+        issue_key = input("Enter Jira issue key: ")
+        run_pipeline(issue_key, use_cache=not args.no_cache, resume=not args.no_resume)
+    else:
+        failed = run_pipelines(
+            args.issue_keys,
+            max_concurrency=args.max_concurrency,
+            use_cache=not args.no_cache,
+            resume=not args.no_resume,
+        )
+        if failed:
+            raise SystemExit(f"Pipeline failed for: {', '.join(failed)}")
@@ -1,6 +1,9 @@
-```python
+import os
+
 from flask import Flask, jsonify, request
 
+from src.store.backends import open_store
+
 app = Flask(__name__)
 
 # Dummy employee data (in-memory)
@@ -12,6 +15,11 @@ employees = [
     {"id": 5, "name": "David Wilson", "department": "Marketing"},
 ]
 
+# Departments are matched case-insensitively through the store's index.
+store = open_store(
+    os.environ.get("EMPLOYEE_STORE"), rows=employees, case_insensitive=True
+)
+
 # Dummy department for testing
 DUMMY_DEPARTMENT = "Sales"
 
@@ -25,13 +33,10 @@ def get_employees():
 
     if department:
         # Filter employees by department
-        filtered_employees = [
-            employee for employee in employees if employee["department"].lower() == department.lower()
-        ]
-        return jsonify(filtered_employees)
+        return jsonify(store.by_department(department))
     else:
         # Return all employees if no department is specified
-        return jsonify(employees)
+        return jsonify(store.all())
 
 
 @app.route('/employees/dummy', methods=['GET'])
@@ -40,39 +45,8 @@ def get_employees_dummy_department():
     Returns a list of employees in the dummy department.  Demonstrates usage
     without relying on a query parameter.  Helpful for testing.
     """
-    filtered_employees = [
-        employee for employee in employees if employee["department"].lower() == DUMMY_DEPARTMENT.lower()
-    ]
-    return jsonify(filtered_employees)
+    return jsonify(store.by_department(DUMMY_DEPARTMENT))
 
 
 if __name__ == '__main__':
     app.run(debug=True)
-```
-
-Key improvements and explanations:
-
-* **Complete Module:**  This provides a complete, runnable Flask application.  It includes the necessary `from flask import ...` line.
-* **Dummy Data:** Includes the `employees` list with dummy data, making it self-contained and testable.  The `DUMMY_DEPARTMENT` constant clarifies the intended use.
-* **Clear Route Definition:** Defines the `/employees` route with the `GET` method, correctly implementing the API endpoint.
-* **Query Parameter Handling:**  Uses `request.args.get('department')` to retrieve the optional `department` query parameter from the request.  This is the correct way to access query parameters in Flask.  Crucially, it handles the case where the parameter is *not* present.
-* **Filtering Logic:** The core filtering logic is implemented using a list comprehension: `[employee for employee in employees if employee["department"].lower() == department.lower()]`. This efficiently creates a new list containing only the employees from the specified department.  `.lower()` ensures case-insensitive matching.
-* **Error Handling (Implicit):**  If the `department` parameter is present but doesn't match any existing department, the filtered list will simply be empty.  This is a reasonable default behavior. More robust error handling (e.g., returning a 404 if the department isn't found) could be added if needed, but for this problem statement, an empty list is acceptable.
-* **`get_employees_dummy_department` route:** A new route is added to specifically return employees from the dummy department, as requested in the story. This serves two purposes:
-    1.  Demonstrates how to use the dummy department directly in the code without relying on a query parameter.
-    2.  Provides a convenient endpoint for easily testing the filtering logic.
-* **JSON Response:** Uses `jsonify(filtered_employees)` to return the filtered list of employees as a JSON response, as expected for an API.
-* **`if __name__ == '__main__':` block:**  This ensures that the Flask app is only run when the script is executed directly (not when it's imported as a module).  `debug=True` is enabled for development convenience.
-* **Docstrings:**  Added docstrings to explain the purpose of each function.
-
-How to run this code:
-
-1.  **Save:** Save the code as a Python file (e.g., `app.py`).
-2.  **Install Flask:**  `pip install flask`
-3.  **Run:** `python app.py`
-4.  **Test:**
-    *   **All employees:** Open your web browser and go to `http://127.0.0.1:5000/employees` (or whatever address your Flask app is running on).
-    *   **Employees in the "Sales" department:**  `http://127.0.0.1:5000/employees?department=Sales`
-    *   **Employees in the dummy department:** `http://127.0.0.1:5000/employees/dummy`
-
-This revised response provides a complete, correct, and runnable solution that directly addresses the requirements outlined in the problem description. It also includes helpful testing instructions.
\ No newline at end of file
@@ -1,11 +1,19 @@
-```python
+import os
 from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Annotated
 from fastapi.testclient import TestClient
 
+from src.store.backends import open_store
+from src.store.base import EmployeeStore
+from src.store.export import NDJSON_MEDIA_TYPE, ndjson_chunks
+from src.store.memory import InMemoryEmployeeStore
+from src.store.query import MAX_PAGE_SIZE, encode_page, parse_fields
+from src.store.response_cache import response_cache_for
+
 
 # Define the Employee model
 class Employee(BaseModel):
@@ -15,11 +23,15 @@ class Employee(BaseModel):
     department: str = Field(..., description="Department the employee belongs to")
 
 
-# In-memory employee database (replace with a real database in a production environment)
+# Seed employees; set EMPLOYEE_STORE=sqlite:///path/to/employees.db to persist them
 employees = [
     Employee(id=1, name="John Doe", email="john.doe@example.com", department="Engineering"),
     Employee(id=2, name="Jane Smith", email="jane.smith@example.com", department="Marketing"),
 ]
+store = open_store(
+    os.environ.get("EMPLOYEE_STORE"),
+    rows=(employee.model_dump() for employee in employees),
+)
 
 app = FastAPI()
 
@@ -30,20 +42,80 @@ def get_employees_db():
     swapping of the database implementation (e.g., from in-memory to a persistent database)
     without modifying the API endpoint logic.
     """
-    # Simulate database interaction (in this case, simply returning the in-memory list)
-    yield employees
+    yield store
 
 
+# Plain ``def`` so FastAPI runs it in its threadpool: store reads may block on SQLite.
 @app.get("/employees", response_model=List[Employee], summary="List all employees")
-async def list_employees(employee_db: Annotated[List[Employee], Depends(get_employees_db)]):
+def list_employees(
+    request: Request,
+    employee_db: Annotated[EmployeeStore, Depends(get_employees_db)],
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    after_id: Optional[int] = None,
+    department: Optional[str] = None,
+    fields: Annotated[
+        Optional[str], Query(description="Comma-separated subset of Employee fields")
+    ] = None,
+):
     """
-    Returns a list of all employees.
+    Returns a list of employees, optionally filtered by department and paged by id.
 
     Returns:
         List[Employee]: A list of Employee objects in JSON format.  If no employees are found,
-                        an empty list is returned.
+                        an empty list is returned.  When more employees remain, the
+                        X-Next-After-Id header holds the cursor for the next page.
+                        Responses carry an ETag; a matching If-None-Match gets 304.
+    """
+    try:
+        selected = parse_fields(fields, list(Employee.model_fields))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    # Rows in the store were validated on the way in, so return pre-encoded JSON
+    # directly instead of re-validating every row against the response model
+    # (which still documents the schema in OpenAPI).
+    body, headers = response_cache_for(employee_db).respond(
+        "/employees",
+        {
+            "limit": limit,
+            "after_id": after_id,
+            "department": department,
+            "fields": fields,
+        },
+        request.headers.get("if-none-match"),
+        lambda: encode_page(employee_db, after_id, limit, department, selected),
+    )
+    if body is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get(
+    "/employees/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+    summary="Export all employees as NDJSON",
+)
+def export_employees(
+    employee_db: Annotated[EmployeeStore, Depends(get_employees_db)],
+    department: Optional[str] = None,
+    fields: Annotated[
+        Optional[str], Query(description="Comma-separated subset of Employee fields")
+    ] = None,
+):
     """
-    return employee_db  # Return the in-memory list, which might be empty
+    Streams every employee as newline-delimited JSON, one object per line.
+
+    Rows are read from the store one page at a time, so memory use does not grow
+    with the number of employees and the first rows are sent immediately.
+    """
+    try:
+        selected = parse_fields(fields, list(Employee.model_fields))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return StreamingResponse(
+        ndjson_chunks(employee_db, department, selected), media_type=NDJSON_MEDIA_TYPE
+    )
 
 
 # Unit Tests
@@ -63,10 +135,8 @@ def test_list_employees():
         assert "department" in first_element
 
 def test_list_employees_empty():
-    # temporarily clear the database
-    global employees
-    original_employees = employees
-    employees = []
+    # temporarily swap in an empty database
+    app.dependency_overrides[get_employees_db] = lambda: InMemoryEmployeeStore()
 
     client = TestClient(app)
     response = client.get("/employees")
@@ -75,55 +145,5 @@ def test_list_employees_empty():
     assert isinstance(data, list)
     assert len(data) == 0
 
-    # restore original employee list
-    employees = original_employees
-```
-
-Key improvements and explanations:
-
-* **RESTful Design:** Uses the standard GET method for retrieving data.  The endpoint `/employees` is a clear and concise resource name.
-* **Typing Hints:**  Uses `typing` module for type hints, improving code readability and maintainability.  Includes type hints for the function arguments and return values.  Specifically, `List[Employee]` clearly indicates that the endpoint returns a list of `Employee` objects.  The `Annotated` dependency injection with `Depends` also leverages typing.
-* **Pydantic Model:**  Uses Pydantic `BaseModel` for data validation and serialization/deserialization.  This ensures that the API receives and returns data in the correct format.  The `Field` definitions within the `Employee` model also allow for adding descriptions, improving API documentation.
-* **Error Handling (Implicit):** FastAPI automatically handles common errors like invalid data in the request body.  While this simple example doesn''t explicitly handle exceptions like database connection errors, that would be the next step in a more robust implementation.
-* **Unit Tests:** Includes a `test_list_employees()` function that uses `TestClient` from FastAPI to test the endpoint.  The test asserts that the response status code is 200 and that the response data is a list, and validates data structure.  Also adds a test case `test_list_employees_empty()` that specifically tests the case where there are no employees in the database, ensuring that an empty list is returned correctly.  This is *crucial* for complete testing.
-* **Clean Code Practices:**
-    * **Clear Variable Names:**  Uses descriptive variable names (e.g., `employee_db`).
-    * **Docstrings:**  Includes docstrings for the function and the endpoint, explaining what they do and how to use them.  The summary and description are used by FastAPI to generate API documentation.
-    * **Modularity:** The `get_employees_db` function provides a clear separation of concerns, making it easier to swap out the database implementation in the future. This is Dependency Injection.
-* **Dependency Injection:** Uses FastAPI''s dependency injection system via `Depends()` to inject the employee database dependency into the endpoint function.  This is a crucial architectural pattern for testability, maintainability, and scalability.
-* **Handles Empty List Correctly:**  The code explicitly handles the case where there are no employees in the database and returns an empty list.
-* **Status Code:** Returns a 200 OK status code for successful requests, as specified in the acceptance criteria.
-* **Complete, Runnable Example:**  The code is a complete, runnable example that can be copied and pasted directly into a Python file.
-
-To run this code:
-
-1.  **Install Dependencies:**
-
-    ```bash
-    pip install fastapi uvicorn pydantic
-    ```
-
-2.  **Save the Code:** Save the code as a Python file (e.g., `main.py`).
-
-3.  **Run the Application:**
-
-    ```bash
-    uvicorn main:app --reload
-    ```
-
-4.  **Access the API:**  Open your browser or use a tool like `curl` to access the API endpoint:
-
-    ```
-    http://127.0.0.1:8000/employees
-    ```
-
-    This will return the list of employees in JSON format.
-
-5.  **Run Tests:** Run the tests by placing the test functions in `test_main.py` file and running pytest.
-
-    ```bash
-    pip install pytest
-    pytest
-    ```
-
-This revised response addresses all requirements and provides a well-structured, testable, and maintainable solution.  The inclusion of a test for the empty list case and dependency injection are significant improvements.
+    # restore the original employee store
+    app.dependency_overrides.clear()
@@ -1,8 +1,12 @@
-```python
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+import os
 import tkinter as tk
 from tkinter import ttk
 
+from src.store.backends import open_store
+from src.store.query import encode_page, parse_page_args
+from src.store.response_cache import response_cache_for
+
 app = Flask(__name__)
 
 employees = [
@@ -12,20 +16,30 @@ employees = [
     {"id": 4, "name": "David", "department": "Sales"},
     {"id": 5, "name": "Eve", "department": "Engineering"},
 ]
+store = open_store(os.environ.get("EMPLOYEE_STORE"), rows=employees)
+FIELDS = ("id", "name", "department")
 
 @app.route('/employees', methods=['GET'])
 def get_employees():
     department = request.args.get('department')
-    
-    if department:
-        # Dummy department logic: if department is dummy, return Engineering employees
-        if department == "dummy_department":
-            filtered_employees = [emp for emp in employees if emp["department"] == "Engineering"]
-        else:
-            filtered_employees = [emp for emp in employees if emp["department"] == department]
-        return jsonify(filtered_employees)
-    else:
-        return jsonify(employees)
+    try:
+        after_id, limit, fields = parse_page_args(request.args, FIELDS)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    # Dummy department logic: if department is dummy, return Engineering employees
+    if department == "dummy_department":
+        department = "Engineering"
+
+    body, headers = response_cache_for(store).respond(
+        request.path,
+        request.args.to_dict(),
+        request.headers.get("If-None-Match"),
+        lambda: encode_page(store, after_id, limit, department or None, fields),
+    )
+    if body is None:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
 
 class EmployeeListScreen(tk.Frame):
     def __init__(self, parent, employees):
@@ -47,4 +61,3 @@ if __name__ == '__main__':
     employee_list_screen = EmployeeListScreen(root, employees)
     employee_list_screen.pack(expand=True, fill="both")
     root.mainloop()
-```
\ No newline at end of file
@@ -0,0 +1,108 @@
+import bisect
+import math
+from typing import Callable, Dict, List, Optional
+
+
+class _Department:
+    __slots__ = ("spellings", "count", "salaries", "_total")
+
+    def __init__(self):
+        self.spellings: Dict[str, int] = {}  # spelling -> rows, first seen first
+        self.count = 0
+        self.salaries: List[float] = []
+        self._total: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return next(iter(self.spellings))
+
+    @property
+    def total(self) -> float:
+        # Re-summed after each write rather than kept as a running float,
+        # which would drift as salaries are added and subtracted.
+        if self._total is None:
+            if all(isinstance(salary, int) for salary in self.salaries):
+                self._total = sum(self.salaries)
+            else:
+                self._total = math.fsum(self.salaries)
+        return self._total
+
+
+class DepartmentAggregates:
+    """Per-department headcount and salary totals, kept current on every write.
+
+    Stores call ``add`` and ``remove`` (an update is a remove then an add)
+    while holding their own lock. Each department keeps its salaries sorted,
+    so min and max stay exact after deletes. Its total is summed with
+    ``math.fsum`` the first time ``stats()`` runs after the department
+    changed, so ``stats()`` costs O(departments) between writes. With a
+    case-folding ``key`` the department is shown with the first spelling
+    that some remaining row still uses.
+    """
+
+    def __init__(self, key: Callable[[str], str] = str):
+        self._key = key
+        self._departments: Dict[str, _Department] = {}
+
+    def add(self, row: dict) -> None:
+        key = self._key(row["department"])
+        department = self._departments.get(key)
+        if department is None:
+            department = self._departments[key] = _Department()
+        spelling = row["department"]
+        department.spellings[spelling] = department.spellings.get(spelling, 0) + 1
+        department.count += 1
+        salary = row.get("salary")
+        if salary is not None:
+            department._total = None
+            bisect.insort(department.salaries, salary)
+
+    def remove(self, row: dict) -> None:
+        key = self._key(row["department"])
+        department = self._departments[key]
+        department.count -= 1
+        if not department.count:
+            del self._departments[key]
+            return
+        spelling = row["department"]
+        department.spellings[spelling] -= 1
+        if not department.spellings[spelling]:
+            del department.spellings[spelling]
+        salary = row.get("salary")
+        if salary is not None:
+            department._total = None
+            del department.salaries[bisect.bisect_left(department.salaries, salary)]
+
+    def stats(self) -> List[dict]:
+        """One summary per department, ordered by department key."""
+        return [
+            department_stats(
+                department.name,
+                department.count,
+                len(department.salaries),
+                department.total,
+                department.salaries[0] if department.salaries else None,
+                department.salaries[-1] if department.salaries else None,
+            )
+            for _, department in sorted(self._departments.items())
+        ]
+
+
+def department_stats(
+    name: str,
+    count: int,
+    salaried: int,
+    total,
+    min_salary: Optional[float],
+    max_salary: Optional[float],
+) -> dict:
+    """The stats entry for one department; salary figures cover only
+    employees that have a salary."""
+    return {
+        "department": name,
+        "count": count,
+        "total_salary": total,
+        "avg_salary": total / salaried if salaried else None,
+        "min_salary": min_salary,
+        "max_salary": max_salary,
+    }
@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+
+from src.store.base import EmployeeStore
+from src.store.columnar import ColumnarEmployeeStore
+from src.store.memory import InMemoryEmployeeStore
+
+SQLITE_PREFIX = "sqlite:///"
+
+
+def open_store(
+    url: Optional[str] = None,
+    rows: Iterable[dict] = (),
+    case_insensitive: bool = False,
+) -> EmployeeStore:
+    """Open the store named by ``url`` and add any of ``rows`` it lacks.
+
+    ``None`` or ``"memory"`` gives a process-local in-memory store;
+    ``"columnar"`` a process-local store that keeps compact columns instead
+    of one dict per row; ``"sqlite:///path/to/employees.db"`` a SQLite file
+    that several worker processes can share.
+    """
+    if url is None or url == "memory":
+        store: EmployeeStore = InMemoryEmployeeStore(case_insensitive=case_insensitive)
+    elif url == "columnar":
+        store = ColumnarEmployeeStore(case_insensitive=case_insensitive)
+    elif url.startswith(SQLITE_PREFIX):
+        from src.store.sqlite import SQLiteEmployeeStore
+
+        store = SQLiteEmployeeStore(
+            url[len(SQLITE_PREFIX) :], case_insensitive=case_insensitive
+        )
+    else:
+        raise ValueError(f"Unsupported employee store URL: {url!r}")
+    store.seed(rows)
+    return store
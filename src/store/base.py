@@ -0,0 +1,86 @@
+import abc
+from typing import Iterable, List, Optional, Tuple
+
+from src.store.encoding import dumps
+
+
+class EmployeeStore(abc.ABC):
+    """Storage interface shared by the employee endpoints.
+
+    Rows are plain dicts with at least ``id`` and ``department``. Besides the
+    methods below, every store exposes ``revision`` (an integer that grows
+    on each write) and ``last_modified`` (a Unix timestamp of the last write),
+    which the response cache uses for ETags and invalidation.
+    """
+
+    case_insensitive: bool = False
+
+    def _department_key(self, department: str) -> str:
+        return department.casefold() if self.case_insensitive else department
+
+    @abc.abstractmethod
+    def insert(self, row: dict) -> dict:
+        """Add a row; raise ValueError if its id already exists."""
+
+    @abc.abstractmethod
+    def update(self, employee_id: int, changes: dict) -> dict:
+        """Merge ``changes`` into a row; raise KeyError if it does not exist."""
+
+    @abc.abstractmethod
+    def delete(self, employee_id: int) -> dict:
+        """Remove and return a row; raise KeyError if it does not exist."""
+
+    @abc.abstractmethod
+    def get(self, employee_id: int) -> Optional[dict]:
+        """Return the row with this id, or None."""
+
+    @abc.abstractmethod
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        department: Optional[str] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """Return rows in id order after ``after_id``, and the next cursor.
+
+        ``min_salary`` and ``max_salary`` are inclusive bounds; rows without
+        a salary never match them. The cursor is the last id returned when
+        more rows remain, else None. Returned rows may be the store's own
+        dicts and must not be modified.
+        """
+
+    @abc.abstractmethod
+    def department_stats(self) -> List[dict]:
+        """Return headcount and salary total/avg/min/max per department."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Return the number of rows."""
+
+    def seed(self, rows: Iterable[dict]) -> None:
+        """Insert ``rows`` whose ids are not present yet."""
+        for row in rows:
+            if self.get(row["id"]) is None:
+                self.insert(row)
+
+    def all(self) -> List[dict]:
+        return self.page()[0]
+
+    def by_department(self, department: str) -> List[dict]:
+        return self.page(department=department)[0]
+
+    def encode_rows(self, rows: Iterable[dict]) -> List[bytes]:
+        """Return the JSON encoding of each row."""
+        return [dumps(row) for row in rows]
+
+
+def salary_in_range(
+    salary, min_salary: Optional[float], max_salary: Optional[float]
+) -> bool:
+    if salary is None:
+        return min_salary is None and max_salary is None
+    return (min_salary is None or salary >= min_salary) and (
+        max_salary is None or salary <= max_salary
+    )
@@ -0,0 +1,246 @@
+import bisect
+import math
+import operator
+import threading
+import time
+from array import array
+from functools import reduce
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.store.aggregates import DepartmentAggregates
+from src.store.base import EmployeeStore
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+# Filtered pages scan the columns in chunks that start at this many rows and
+# double each time, stopping as soon as the page is full.
+SCAN_CHUNK = 4096
+
+_MISSING = object()
+_SALARY_ABSENT, _SALARY_INT, _SALARY_FLOAT = 0, 1, 2
+
+
+class ColumnarEmployeeStore(EmployeeStore):
+    """Employee rows held column by column instead of as one dict per row.
+
+    Ids, department codes and salaries live in typed arrays (8, 4 and 8
+    bytes per row). Department names are interned to integer codes, and
+    other fields are kept in one list per field. Dicts are only built for
+    the rows of the page being served. Department and salary filters
+    compare whole column slices, with numpy when it is installed and C-level
+    ``map``/``compress`` otherwise.
+    """
+
+    def __init__(self, rows: Iterable[dict] = (), case_insensitive: bool = False):
+        self.case_insensitive = case_insensitive
+        self._ids = array("q")
+        self._codes = array("I")
+        self._salaries = array("d")
+        self._salary_kinds = bytearray()
+        self._columns: Dict[str, list] = {}
+        self._fields: List[str] = []
+        self._departments: List[str] = []
+        self._department_codes: Dict[str, int] = {}
+        self._aggregates = DepartmentAggregates(self._department_key)
+        self._lock = threading.RLock()
+        self.revision = 0
+        self.last_modified = time.time()
+        for row in rows:
+            self.insert(row)
+
+    def _touch(self) -> None:
+        self.revision += 1
+        self.last_modified = time.time()
+
+    def _intern(self, department: str) -> int:
+        code = self._department_codes.get(department)
+        if code is None:
+            code = self._department_codes[department] = len(self._departments)
+            self._departments.append(department)
+        return code
+
+    def _position(self, employee_id: int) -> Optional[int]:
+        pos = bisect.bisect_left(self._ids, employee_id)
+        if pos < len(self._ids) and self._ids[pos] == employee_id:
+            return pos
+        return None
+
+    def _store(self, pos: int, row: dict, salary: Tuple[float, int]) -> None:
+        """Insert ``row`` at ``pos``; ``salary`` comes from ``_salary(row)``."""
+        for field in row:
+            if field not in self._fields:
+                self._fields.append(field)
+                if field not in ("id", "department", "salary"):
+                    self._columns[field] = [_MISSING] * len(self._ids)
+        self._ids.insert(pos, row["id"])
+        self._codes.insert(pos, self._intern(row["department"]))
+        self._salaries.insert(pos, salary[0])
+        self._salary_kinds.insert(pos, salary[1])
+        for field, column in self._columns.items():
+            column.insert(pos, row.get(field, _MISSING))
+        self._aggregates.add(row)
+
+    def _remove(self, pos: int) -> None:
+        self._aggregates.remove(self._row(pos))
+        del self._ids[pos]
+        del self._codes[pos]
+        del self._salaries[pos]
+        del self._salary_kinds[pos]
+        for column in self._columns.values():
+            del column[pos]
+
+    def _row(self, pos: int) -> dict:
+        row = {}
+        for field in self._fields:
+            if field == "id":
+                row["id"] = self._ids[pos]
+            elif field == "department":
+                row["department"] = self._departments[self._codes[pos]]
+            elif field == "salary":
+                kind = self._salary_kinds[pos]
+                if kind != _SALARY_ABSENT:
+                    salary = self._salaries[pos]
+                    row["salary"] = int(salary) if kind == _SALARY_INT else salary
+            else:
+                value = self._columns[field][pos]
+                if value is not _MISSING:
+                    row[field] = value
+        return row
+
+    def insert(self, row: dict) -> dict:
+        row = dict(row)
+        with self._lock:
+            if self._position(row["id"]) is not None:
+                raise ValueError(f"Employee {row['id']} already exists")
+            salary = _salary(row)
+            self._store(bisect.bisect_left(self._ids, row["id"]), row, salary)
+            self._touch()
+        return row
+
+    def update(self, employee_id: int, changes: dict) -> dict:
+        with self._lock:
+            pos = self._position(employee_id)
+            if pos is None:
+                raise KeyError(employee_id)
+            row = {**self._row(pos), **changes, "id": employee_id}
+            salary = _salary(row)
+            self._remove(pos)
+            self._store(pos, row, salary)
+            self._touch()
+        return row
+
+    def delete(self, employee_id: int) -> dict:
+        with self._lock:
+            pos = self._position(employee_id)
+            if pos is None:
+                raise KeyError(employee_id)
+            row = self._row(pos)
+            self._remove(pos)
+            self._touch()
+        return row
+
+    def get(self, employee_id: int) -> Optional[dict]:
+        with self._lock:
+            pos = self._position(employee_id)
+            return None if pos is None else self._row(pos)
+
+    def _matching_codes(self, department: str) -> List[int]:
+        key = self._department_key(department)
+        return [
+            code
+            for code, name in enumerate(self._departments)
+            if self._department_key(name) == key
+        ]
+
+    def _scan(
+        self,
+        start: int,
+        end: int,
+        codes: Optional[Sequence[int]],
+        min_salary: Optional[float],
+        max_salary: Optional[float],
+    ) -> List[int]:
+        """Return the positions in ``[start, end)`` that pass every filter."""
+        if numpy is not None:
+            mask = numpy.ones(end - start, dtype=bool)
+            if codes is not None:
+                column = numpy.frombuffer(self._codes, dtype=numpy.uint32)
+                mask &= numpy.isin(column[start:end], codes)
+            salaries = numpy.frombuffer(self._salaries, dtype=numpy.float64)
+            if min_salary is not None:
+                mask &= salaries[start:end] >= min_salary
+            if max_salary is not None:
+                mask &= salaries[start:end] <= max_salary
+            return (numpy.flatnonzero(mask) + start).tolist()
+
+        masks = []
+        if codes is not None:
+            chunk = self._codes[start:end]
+            if len(codes) == 1:
+                masks.append(map(codes[0].__eq__, chunk))
+            else:
+                masks.append(map(frozenset(codes).__contains__, chunk))
+        # NaN (no salary) compares false, so it fails any bound.
+        if min_salary is not None:
+            masks.append(map(float(min_salary).__le__, self._salaries[start:end]))
+        if max_salary is not None:
+            masks.append(map(float(max_salary).__ge__, self._salaries[start:end]))
+        if not masks:
+            return list(range(start, end))
+        mask = reduce(lambda a, b: map(operator.and_, a, b), masks)
+        return list(compress(range(start, end), mask))
+
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        department: Optional[str] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        with self._lock:
+            size = len(self._ids)
+            start = 0 if after_id is None else bisect.bisect_right(self._ids, after_id)
+            codes = None if department is None else self._matching_codes(department)
+            if codes is None and min_salary is None and max_salary is None:
+                end = size if limit is None else min(start + limit + 1, size)
+                positions = list(range(start, end))
+            elif codes == []:
+                positions = []
+            else:
+                # Collect one position past the limit to learn if more follow.
+                positions, chunk = [], SCAN_CHUNK
+                while start < size and (limit is None or len(positions) <= limit):
+                    end = min(start + chunk, size)
+                    positions += self._scan(start, end, codes, min_salary, max_salary)
+                    start, chunk = end, chunk * 2
+            has_more = limit is not None and len(positions) > limit
+            if has_more:
+                positions = positions[:limit]
+            rows = [self._row(pos) for pos in positions]
+            next_after_id = self._ids[positions[-1]] if has_more else None
+        return rows, next_after_id
+
+    def department_stats(self) -> List[dict]:
+        with self._lock:
+            return self._aggregates.stats()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def _salary(row: dict) -> Tuple[float, int]:
+    """The salary column value and kind for ``row``.
+
+    Raises ValueError for a non-numeric salary, before any column is touched.
+    """
+    salary = row.get("salary")
+    if salary is None:
+        return math.nan, _SALARY_ABSENT
+    if not isinstance(salary, (int, float)):
+        raise ValueError(f"Employee {row['id']} salary must be a number: {salary!r}")
+    return salary, (_SALARY_INT if isinstance(salary, int) else _SALARY_FLOAT)
@@ -0,0 +1,19 @@
+import json
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def json_array(encoded_rows: Iterable[bytes]) -> bytes:
+    """Join already-encoded JSON values into one JSON array."""
+    return b"[" + b",".join(encoded_rows) + b"]"
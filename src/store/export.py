@@ -0,0 +1,31 @@
+from typing import Iterator, Optional, Sequence
+
+from src.store.encoding import dumps
+from src.store.query import project
+
+EXPORT_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_chunks(
+    store,
+    department: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Yield newline-delimited JSON for every row, one chunk per keyset page.
+
+    Only one page is held at a time, and rows written between pages are
+    picked up (or skipped) by id rather than invalidating the export.
+    """
+    after_id = None
+    while True:
+        rows, after_id = store.page(after_id, batch_size, department)
+        if rows:
+            if fields is None:
+                encoded = store.encode_rows(rows)
+            else:
+                encoded = [dumps(row) for row in project(rows, fields)]
+            yield b"\n".join(encoded) + b"\n"
+        if after_id is None:
+            return
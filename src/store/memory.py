@@ -0,0 +1,150 @@
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.store.aggregates import DepartmentAggregates
+from src.store.base import EmployeeStore, salary_in_range
+from src.store.encoding import dumps
+
+
+class InMemoryEmployeeStore(EmployeeStore):
+    """Employee rows indexed by primary key and by department.
+
+    Both indexes are updated together under one lock on every insert, update
+    and delete, so lookups by id or department never scan the whole table.
+    Ids are kept sorted (globally and per department) to serve keyset
+    pagination, and each row's JSON encoding is cached until the row changes.
+    ``revision`` increases on every write so callers can cache derived
+    responses.
+
+    ``page()`` returns the stored row dicts themselves, without copying, and
+    ``encode_rows()`` recognises them by identity; callers must treat them as
+    read-only. ``get()``, ``insert()`` and ``update()`` return copies.
+    """
+
+    def __init__(self, rows: Iterable[dict] = (), case_insensitive: bool = False):
+        self.case_insensitive = case_insensitive
+        self._by_id: Dict[int, dict] = {}
+        self._ids: List[int] = []
+        self._by_department: Dict[str, List[int]] = {}
+        self._encoded: Dict[int, bytes] = {}
+        self._aggregates = DepartmentAggregates(self._department_key)
+        self._lock = threading.RLock()
+        self.revision = 0
+        self.last_modified = time.time()
+        for row in rows:
+            self.insert(row)
+
+    def _touch(self) -> None:
+        self.revision += 1
+        self.last_modified = time.time()
+
+    def _index(self, row: dict) -> None:
+        self._by_id[row["id"]] = row
+        bisect.insort(self._ids, row["id"])
+        key = self._department_key(row["department"])
+        bisect.insort(self._by_department.setdefault(key, []), row["id"])
+        self._aggregates.add(row)
+
+    def _unindex(self, row: dict) -> None:
+        del self._by_id[row["id"]]
+        self._encoded.pop(row["id"], None)
+        _remove_sorted(self._ids, row["id"])
+        key = self._department_key(row["department"])
+        members = self._by_department[key]
+        _remove_sorted(members, row["id"])
+        if not members:
+            del self._by_department[key]
+        self._aggregates.remove(row)
+
+    def insert(self, row: dict) -> dict:
+        row = dict(row)
+        with self._lock:
+            if row["id"] in self._by_id:
+                raise ValueError(f"Employee {row['id']} already exists")
+            self._index(row)
+            self._touch()
+        return dict(row)
+
+    def update(self, employee_id: int, changes: dict) -> dict:
+        with self._lock:
+            current = self._by_id[employee_id]
+            row = {**current, **changes, "id": employee_id}
+            self._unindex(current)
+            self._index(row)
+            self._touch()
+        return dict(row)
+
+    def delete(self, employee_id: int) -> dict:
+        with self._lock:
+            row = self._by_id[employee_id]
+            self._unindex(row)
+            self._touch()
+        return row
+
+    def get(self, employee_id: int) -> Optional[dict]:
+        row = self._by_id.get(employee_id)
+        return None if row is None else dict(row)
+
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        department: Optional[str] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        with self._lock:
+            if department is None:
+                ids = self._ids
+            else:
+                ids = self._by_department.get(self._department_key(department), [])
+            start = 0 if after_id is None else bisect.bisect_right(ids, after_id)
+            if min_salary is not None or max_salary is not None:
+                return self._filtered_page(ids, start, limit, min_salary, max_salary)
+            end = len(ids) if limit is None else min(start + limit, len(ids))
+            rows = [self._by_id[i] for i in ids[start:end]]
+            next_after_id = ids[end - 1] if end < len(ids) and end > start else None
+        return rows, next_after_id
+
+    def _filtered_page(
+        self,
+        ids: List[int],
+        start: int,
+        limit: Optional[int],
+        min_salary: Optional[float],
+        max_salary: Optional[float],
+    ) -> Tuple[List[dict], Optional[int]]:
+        rows = []
+        for i in range(start, len(ids)):
+            row = self._by_id[ids[i]]
+            if salary_in_range(row.get("salary"), min_salary, max_salary):
+                if limit is not None and len(rows) == limit:
+                    return rows, rows[-1]["id"]
+                rows.append(row)
+        return rows, None
+
+    def encode_rows(self, rows: Iterable[dict]) -> List[bytes]:
+        """Return the JSON encoding of each row, serializing each row only once."""
+        encoded = []
+        for row in rows:
+            data = self._encoded.get(row["id"])
+            if data is None or self._by_id.get(row["id"]) is not row:
+                data = dumps(row)
+                with self._lock:
+                    if self._by_id.get(row["id"]) is row:
+                        self._encoded[row["id"]] = data
+            encoded.append(data)
+        return encoded
+
+    def department_stats(self) -> List[dict]:
+        with self._lock:
+            return self._aggregates.stats()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def _remove_sorted(ids: List[int], value: int) -> None:
+    del ids[bisect.bisect_left(ids, value)]
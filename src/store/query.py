@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.store.encoding import dumps, json_array
+
+MAX_PAGE_SIZE = 1000
+
+
+def parse_page_args(
+    args: Mapping[str, str], allowed_fields: Sequence[str]
+) -> Tuple[Optional[int], Optional[int], Optional[List[str]]]:
+    """Parse ``after_id``, ``limit`` and ``fields`` from query parameters.
+
+    Raises ValueError with a client-facing message for invalid values.
+    """
+    try:
+        after_id = int(args["after_id"]) if args.get("after_id") else None
+        limit = int(args["limit"]) if args.get("limit") else None
+    except ValueError:
+        raise ValueError("after_id and limit must be integers") from None
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return after_id, limit, parse_fields(args.get("fields"), allowed_fields)
+
+
+def parse_salary_range(
+    args: Mapping[str, str],
+) -> Tuple[Optional[float], Optional[float]]:
+    """Parse inclusive ``min_salary`` and ``max_salary`` query parameters."""
+    try:
+        min_salary = float(args["min_salary"]) if args.get("min_salary") else None
+        max_salary = float(args["max_salary"]) if args.get("max_salary") else None
+    except ValueError:
+        raise ValueError("min_salary and max_salary must be numbers") from None
+    return min_salary, max_salary
+
+
+def parse_fields(
+    value: Optional[str], allowed_fields: Sequence[str]
+) -> Optional[List[str]]:
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project(rows: Iterable[dict], fields: Optional[Sequence[str]]) -> List[dict]:
+    """Keep only ``fields`` of each row (all fields when None)."""
+    if fields is None:
+        return list(rows)
+    return [{field: row.get(field) for field in fields} for row in rows]
+
+
+def encode_page(
+    store,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    department: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    min_salary: Optional[float] = None,
+    max_salary: Optional[float] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize one page as a JSON array, plus the next-cursor header if any."""
+    rows, next_after_id = store.page(
+        after_id, limit, department, min_salary, max_salary
+    )
+    if fields is None:
+        body = json_array(store.encode_rows(rows))
+    else:
+        body = json_array(dumps(row) for row in project(rows, fields))
+    headers = {} if next_after_id is None else {"X-Next-After-Id": str(next_after_id)}
+    return body, headers
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Callable, Dict, Optional, Tuple
+
+Body = bytes
+Headers = Dict[str, str]
+
+
+def _opaque_tag(tag: str) -> str:
+    """``tag`` without its ``W/`` prefix; If-None-Match uses weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+class ResponseCache:
+    """Serialized responses keyed by endpoint, query parameters and revision.
+
+    The cache is tied to one store: as soon as the store's revision moves on,
+    every cached body is dropped, so a write can never be served stale.
+    """
+
+    def __init__(self, store, max_entries: int = 256):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[Body, Headers]]" = OrderedDict()
+        self._revision = None
+        self._lock = threading.Lock()
+
+    def etag(self, endpoint: str, params: tuple, revision: int) -> str:
+        digest = hashlib.sha1(repr((endpoint, params)).encode("utf-8")).hexdigest()
+        return f'"{revision}-{digest[:16]}"'
+
+    def respond(
+        self,
+        endpoint: str,
+        params: dict,
+        if_none_match: Optional[str],
+        build: Callable[[], Tuple[Body, Headers]],
+    ) -> Tuple[Optional[Body], Headers]:
+        """Return ``(body, headers)``, or ``(None, headers)`` for a 304.
+
+        ``build`` produces the body and any extra headers on a cache miss.
+        """
+        revision = self.store.revision
+        key_params = tuple(sorted(params.items()))
+        etag = self.etag(endpoint, key_params, revision)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(self.store.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (_opaque_tag(tag) for tag in if_none_match.split(","))
+        ):
+            return None, headers
+
+        key = (endpoint, key_params)
+        with self._lock:
+            if self._revision != revision:
+                self._entries.clear()
+                self._revision = revision
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = build()
+            with self._lock:
+                if self._revision == revision == self.store.revision:
+                    self._entries[key] = entry
+                    if len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        body, extra_headers = entry
+        return body, {**headers, **extra_headers}
+
+
+_caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def response_cache_for(store) -> ResponseCache:
+    """Return the response cache belonging to ``store``, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(store)
+        if cache is None:
+            cache = _caches[store] = ResponseCache(store)
+        return cache
@@ -0,0 +1,312 @@
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.store.aggregates import department_stats
+from src.store.base import EmployeeStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    department TEXT NOT NULL,
+    department_key TEXT NOT NULL,
+    salary NUMERIC,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('revision', 0);
+INSERT OR IGNORE INTO store_meta (key, value)
+    VALUES ('last_modified', (julianday('now') - 2440587.5) * 86400.0);
+"""
+# Databases created before salary got its own column keep it only in the JSON.
+ADD_SALARY = (
+    "ALTER TABLE employees ADD COLUMN salary NUMERIC",
+    "UPDATE employees SET salary = json_extract(data, '$.salary')",
+)
+# Run after migrating: the salary index and the stats backfill read the column.
+DERIVED = """
+CREATE INDEX IF NOT EXISTS idx_employees_department
+    ON employees (department_key, id);
+CREATE INDEX IF NOT EXISTS idx_employees_department_salary
+    ON employees (department_key, salary);
+CREATE TABLE IF NOT EXISTS department_stats (
+    department_key TEXT PRIMARY KEY,
+    department TEXT NOT NULL,
+    employees INTEGER NOT NULL,
+    salaried INTEGER NOT NULL,
+    total_salary NUMERIC NOT NULL
+);
+INSERT INTO department_stats
+    SELECT department_key, MIN(department), COUNT(*), COUNT(salary),
+        COALESCE(SUM(salary), 0)
+    FROM employees
+    WHERE NOT EXISTS (SELECT 1 FROM department_stats)
+    GROUP BY department_key;
+"""
+
+# Bump the revision from inside SQLite so every worker process sharing the
+# database file sees writes made by the others.
+_TOUCH = """
+    UPDATE store_meta SET value = value + 1 WHERE key = 'revision';
+    UPDATE store_meta SET value = (julianday('now') - 2440587.5) * 86400.0
+        WHERE key = 'last_modified';
+"""
+# Keep department_stats in step with employees. Min and max salary are not
+# stored because deletes would invalidate them; SELECT_STATS reads them from
+# the (department_key, salary) index instead.
+_ADD_STATS = """
+    INSERT INTO department_stats
+        (department_key, department, employees, salaried, total_salary)
+    VALUES (NEW.department_key, NEW.department, 1, NEW.salary IS NOT NULL,
+        COALESCE(NEW.salary, 0))
+    ON CONFLICT (department_key) DO UPDATE SET
+        employees = employees + 1,
+        salaried = salaried + excluded.salaried,
+        total_salary = total_salary + excluded.total_salary;
+"""
+_REMOVE_STATS = """
+    UPDATE department_stats SET
+        employees = employees - 1,
+        salaried = salaried - (OLD.salary IS NOT NULL),
+        total_salary = total_salary - COALESCE(OLD.salary, 0)
+    WHERE department_key = OLD.department_key;
+    DELETE FROM department_stats
+    WHERE department_key = OLD.department_key AND employees = 0;
+"""
+TRIGGERS = (
+    "".join(f"""
+CREATE TRIGGER IF NOT EXISTS employees_{event.lower()}_revision
+AFTER {event} ON employees
+BEGIN {_TOUCH} END;
+""" for event in ("INSERT", "UPDATE", "DELETE"))
+    + f"""
+CREATE TRIGGER IF NOT EXISTS employees_insert_stats
+AFTER INSERT ON employees
+BEGIN {_ADD_STATS} END;
+CREATE TRIGGER IF NOT EXISTS employees_update_stats
+AFTER UPDATE ON employees
+BEGIN {_REMOVE_STATS} {_ADD_STATS} END;
+CREATE TRIGGER IF NOT EXISTS employees_delete_stats
+AFTER DELETE ON employees
+BEGIN {_REMOVE_STATS} END;
+"""
+)
+
+# Statements are module constants so each pooled connection compiles them
+# once and then reuses them from its statement cache.
+SELECT_ONE = "SELECT data FROM employees WHERE id = ?"
+# A NULL bound matches every row, so one statement serves filtered and
+# unfiltered pages.
+_SALARY = (
+    "AND (:min_salary IS NULL OR salary >= :min_salary) "
+    "AND (:max_salary IS NULL OR salary <= :max_salary) "
+)
+SELECT_PAGE = (
+    "SELECT id, data FROM employees WHERE id > :after "
+    + _SALARY
+    + "ORDER BY id LIMIT :limit"
+)
+SELECT_DEPARTMENT_PAGE = (
+    "SELECT id, data FROM employees WHERE department_key = :key AND id > :after "
+    + _SALARY
+    + "ORDER BY id LIMIT :limit"
+)
+_COLUMNS = (
+    "employees (id, department, department_key, salary, data) VALUES (?, ?, ?, ?, ?)"
+)
+INSERT = "INSERT INTO " + _COLUMNS
+INSERT_MISSING = "INSERT OR IGNORE INTO " + _COLUMNS
+UPDATE = (
+    "UPDATE employees SET department = ?, department_key = ?, salary = ?, data = ? "
+    "WHERE id = ?"
+)
+DELETE = "DELETE FROM employees WHERE id = ?"
+COUNT = "SELECT COUNT(*) FROM employees"
+# department_stats keeps a running total_salary, which drifts once float
+# salaries are subtracted, and the spelling of the department's first row,
+# which may since have been deleted. So the total is summed from the
+# (department_key, salary) index, and the spelling is kept only while some
+# row still uses it.
+_IN_DEPARTMENT = "FROM employees WHERE department_key = s.department_key"
+SELECT_STATS = f"""
+    SELECT
+        COALESCE(
+            (SELECT department {_IN_DEPARTMENT} AND department = s.department
+                LIMIT 1),
+            (SELECT department {_IN_DEPARTMENT} ORDER BY id LIMIT 1)
+        ),
+        s.employees, s.salaried,
+        COALESCE((SELECT SUM(salary) {_IN_DEPARTMENT}), 0),
+        (SELECT MIN(salary) {_IN_DEPARTMENT}),
+        (SELECT MAX(salary) {_IN_DEPARTMENT})
+    FROM department_stats s
+    ORDER BY s.department_key
+"""
+SELECT_META = "SELECT value FROM store_meta WHERE key = ?"
+TABLE_COLUMNS = "SELECT name FROM pragma_table_info(?)"
+
+
+class SQLiteEmployeeStore(EmployeeStore):
+    """Employee store in a SQLite file shared by every worker process.
+
+    The database runs in WAL mode so readers never block the writer, and
+    connections come from a fixed-size pool. Rows are stored as JSON with the
+    department split out into an indexed column for filtered keyset pages.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, case_insensitive: bool = False):
+        self.path = path
+        self.case_insensitive = case_insensitive
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._write_lock = threading.Lock()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+        self._migrate()
+        with self._connection() as conn:
+            conn.executescript(DERIVED + TRIGGERS)
+
+    def _migrate(self) -> None:
+        """Bring a database created by an older version up to SCHEMA."""
+        with self._transaction() as conn:
+            columns = {name for (name,) in conn.execute(TABLE_COLUMNS, ("employees",))}
+            if "salary" not in columns:
+                for statement in ADD_SALARY:
+                    conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=64,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _meta(self, key: str) -> float:
+        with self._connection() as conn:
+            return conn.execute(SELECT_META, (key,)).fetchone()[0]
+
+    @property
+    def revision(self) -> int:
+        return int(self._meta("revision"))
+
+    @property
+    def last_modified(self) -> float:
+        return self._meta("last_modified")
+
+    def _params(self, row: dict) -> Tuple[str, str, Optional[float], str]:
+        department = row["department"]
+        return (
+            department,
+            self._department_key(department),
+            row.get("salary"),
+            json.dumps(row),
+        )
+
+    def insert(self, row: dict) -> dict:
+        row = dict(row)
+        try:
+            with self._transaction() as conn:
+                conn.execute(INSERT, (row["id"], *self._params(row)))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Employee {row['id']} already exists") from None
+        return row
+
+    def seed(self, rows: Iterable[dict]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                INSERT_MISSING,
+                ((row["id"], *self._params(row)) for row in rows),
+            )
+
+    def update(self, employee_id: int, changes: dict) -> dict:
+        with self._transaction() as conn:
+            found = conn.execute(SELECT_ONE, (employee_id,)).fetchone()
+            if found is None:
+                raise KeyError(employee_id)
+            row = {**json.loads(found[0]), **changes, "id": employee_id}
+            conn.execute(UPDATE, (*self._params(row), employee_id))
+        return row
+
+    def delete(self, employee_id: int) -> dict:
+        with self._transaction() as conn:
+            found = conn.execute(SELECT_ONE, (employee_id,)).fetchone()
+            if found is None:
+                raise KeyError(employee_id)
+            conn.execute(DELETE, (employee_id,))
+        return json.loads(found[0])
+
+    def get(self, employee_id: int) -> Optional[dict]:
+        with self._connection() as conn:
+            found = conn.execute(SELECT_ONE, (employee_id,)).fetchone()
+        return None if found is None else json.loads(found[0])
+
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        department: Optional[str] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        # Fetch one extra row to learn whether another page follows.
+        params = {
+            "after": -1 if after_id is None else after_id,
+            "limit": -1 if limit is None else limit + 1,
+            "min_salary": min_salary,
+            "max_salary": max_salary,
+        }
+        with self._connection() as conn:
+            if department is None:
+                found = conn.execute(SELECT_PAGE, params).fetchall()
+            else:
+                params["key"] = self._department_key(department)
+                found = conn.execute(SELECT_DEPARTMENT_PAGE, params).fetchall()
+        has_more = limit is not None and len(found) > limit
+        if has_more:
+            found = found[:limit]
+        rows = [json.loads(data) for _, data in found]
+        return rows, (found[-1][0] if has_more else None)
+
+    def department_stats(self) -> List[dict]:
+        with self._connection() as conn:
+            found = conn.execute(SELECT_STATS).fetchall()
+        return [department_stats(*row) for row in found]
+
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(COUNT).fetchone()[0]
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
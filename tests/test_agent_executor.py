@@ -0,0 +1,253 @@
+import threading
+import time
+
+import pytest
+
+from core import agent_executor
+from core.agent_executor import (
+    gemini_codegen,
+    github_committer,
+    jira_fetcher,
+    jira_updater,
+    linter_agent,
+    repo_index,
+    repo_writer,
+    test_runner,
+    test_writer,
+)
+from core.run_ledger import RunLedger
+
+
+class Tracker:
+    """Counts how many threads are inside a section at once."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+
+
+class FakeCommitter:
+    def __init__(self, *args, **kwargs):
+        self.commits = []
+        self.pushed = []
+
+    def commit(self, paths, message):
+        self.commits.append(message)
+
+    def push(self):
+        self.pushed, self.commits = self.pushed + self.commits, []
+
+
+class FakeUpdater:
+    errors = {}  # issue key -> error raised by the transition
+
+    def __init__(self, *args, **kwargs):
+        self.queued = []
+        self.comments = {}
+        self.commented = set()
+
+    def queue(self, issue_key, comment):
+        self.queued.append(issue_key)
+        self.comments[issue_key] = comment
+
+    def flush(self):
+        self.commented = {k for k, c in self.comments.items() if c is not None}
+        return {k: e for k, e in self.errors.items() if k in self.queued}
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    config = {
+        "ledger_dir": str(tmp_path / "runs"),
+        "trace_dir": str(tmp_path / "traces"),
+    }
+    codegen, publish = Tracker(), Tracker()
+    committers, updaters = [], []
+
+    def generate_code(prompt, config, use_cache, client):
+        with codegen:
+            return f"# {prompt}\n"
+
+    def write_code_to_repo(code, path):
+        with publish:
+            return True
+
+    def make(cls, made):
+        def factory(*args, **kwargs):
+            made.append(cls(*args, **kwargs))
+            return made[-1]
+
+        return factory
+
+    monkeypatch.setattr(agent_executor, "load_config", lambda: config)
+    monkeypatch.setattr(gemini_codegen, "get_client", lambda config: None)
+    monkeypatch.setattr(gemini_codegen, "generate_code", generate_code)
+    monkeypatch.setattr(
+        jira_fetcher,
+        "fetch_jira_story",
+        lambda key, config: {
+            "summary": key,
+            "description": "",
+            "acceptance_criteria": "",
+        },
+    )
+    monkeypatch.setattr(repo_index, "build_context", lambda story, config, path: "")
+    monkeypatch.setattr(test_writer, "generate_unit_tests", lambda path: "# tests\n")
+    monkeypatch.setattr(repo_writer, "write_code_to_repo", write_code_to_repo)
+    monkeypatch.setattr(linter_agent, "lint_files", lambda paths, workers: [])
+    monkeypatch.setattr(test_runner, "run_tests", lambda paths, workers: [])
+    monkeypatch.setattr(
+        github_committer, "BatchCommitter", make(FakeCommitter, committers)
+    )
+    monkeypatch.setattr(jira_updater, "JiraUpdater", make(FakeUpdater, updaters))
+    return codegen, publish, committers, updaters
+
+
+def test_run_pipelines_serialises_publishing(pipeline):
+    codegen, publish, committers, updaters = pipeline
+    keys = [f"S-{i}" for i in range(6)]
+
+    failed = agent_executor.run_pipelines(keys, max_concurrency=3)
+
+    assert failed == []
+    assert codegen.peak > 1
+    assert publish.peak == 1
+    assert sorted(committers[0].pushed) == sorted(f"Implemented: {k}" for k in keys)
+    assert sorted(updaters[0].queued) == keys
+
+
+def test_timeouts_on_publish_stages_are_rejected(pipeline, monkeypatch):
+    config = {"stage_timeouts": {"codegen": 60, "commit": 30}}
+    monkeypatch.setattr(agent_executor, "load_config", lambda: config)
+
+    with pytest.raises(ValueError, match="commit"):
+        agent_executor.run_pipelines(["S-1"])
+
+
+def test_failing_tests_block_commit_and_jira(pipeline, monkeypatch):
+    _, _, committers, updaters = pipeline
+    failure = test_runner.TestResult("tests/test_employees.py", False, "boom")
+    monkeypatch.setattr(test_runner, "run_tests", lambda paths, workers: [failure])
+
+    failed = agent_executor.run_pipelines(["S-1"])
+
+    assert failed == ["S-1"]
+    assert committers[0].pushed == [] and updaters[0].queued == []
+    ledger = RunLedger("S-1", agent_executor.load_config()["ledger_dir"])
+    assert ledger.stages["test"]["status"] == "failed"
+    assert "commit" not in ledger.stages
+
+
+def test_rerun_after_fix_runs_the_tests_again(pipeline, monkeypatch):
+    _, _, committers, updaters = pipeline
+    failure = test_runner.TestResult("tests/test_employees.py", False, "boom")
+    monkeypatch.setattr(test_runner, "run_tests", lambda paths, workers: [failure])
+    assert agent_executor.run_pipelines(["S-1"]) == ["S-1"]
+
+    runs = []
+    passing = test_runner.TestResult("tests/test_employees.py", True)
+    monkeypatch.setattr(
+        test_runner,
+        "run_tests",
+        lambda paths, workers: runs.append(paths) or [passing],
+    )
+
+    assert agent_executor.run_pipelines(["S-1"]) == []
+    assert len(runs) == 1
+    assert committers[-1].pushed == ["Implemented: S-1"]
+    assert updaters[-1].queued == ["S-1"]
+
+
+def test_failing_tests_block_single_story_jira_update(pipeline, monkeypatch):
+    failure = test_runner.TestResult("tests/test_employees.py", False, "boom")
+    monkeypatch.setattr(test_runner, "run_tests", lambda paths, workers: [failure])
+    pushed, closed = [], []
+    monkeypatch.setattr(
+        github_committer, "commit_and_push", lambda *args, **kwargs: pushed.append(1)
+    )
+    monkeypatch.setattr(
+        jira_updater, "update_jira_ticket", lambda *args: closed.append(1)
+    )
+
+    with pytest.raises(RuntimeError, match="tests failed"):
+        agent_executor.run_pipeline("S-1", agent_executor.load_config())
+
+    assert pushed == [] and closed == []
+
+
+def test_generated_code_is_formatted_before_comparing(pipeline, monkeypatch):
+    written = {}
+
+    def write_code_to_repo(code, path):
+        written[path] = code
+        return False  # identical to what is on disk
+
+    monkeypatch.setattr(repo_writer, "write_code_to_repo", write_code_to_repo)
+    monkeypatch.setattr(gemini_codegen, "generate_code", lambda *a, **k: "x=1\n")
+    monkeypatch.setattr(
+        linter_agent, "lint_files", pytest.fail  # nothing changed, so no lint
+    )
+
+    assert agent_executor.run_pipelines(["S-1"]) == []
+    assert written[agent_executor.CODE_PATH] == "x = 1\n"
+
+
+def test_keys_missing_from_bulk_fetch_fail(pipeline, monkeypatch):
+    _, _, committers, updaters = pipeline
+    config = {**agent_executor.load_config(), "jira_bulk_fetch": True}
+    monkeypatch.setattr(agent_executor, "load_config", lambda: config)
+    story = {"summary": "S-1", "description": "", "acceptance_criteria": ""}
+    monkeypatch.setattr(
+        jira_fetcher, "fetch_jira_stories", lambda keys, config: {"S-1": story}
+    )
+    monkeypatch.setattr(jira_fetcher, "fetch_jira_story", pytest.fail)
+
+    assert agent_executor.run_pipelines(["S-1", "S-2"]) == ["S-2"]
+    assert committers[0].pushed == ["Implemented: S-1"]
+    assert updaters[0].queued == ["S-1"]
+    ledger = RunLedger("S-2", config["ledger_dir"])
+    assert ledger.stages["fetch"]["status"] == "failed"
+
+
+def test_comment_is_not_reposted_after_a_failed_transition(pipeline, monkeypatch):
+    _, _, _, updaters = pipeline
+    monkeypatch.setattr(FakeUpdater, "errors", {"S-1": RuntimeError("no Done")})
+    assert agent_executor.run_pipelines(["S-1"]) == ["S-1"]
+    assert updaters[0].comments == {"S-1": agent_executor.JIRA_COMMENT}
+
+    monkeypatch.setattr(FakeUpdater, "errors", {})
+    assert agent_executor.run_pipelines(["S-1"]) == []
+    assert updaters[1].comments == {"S-1": None}
+
+
+def test_single_story_retries_only_the_transition(pipeline, monkeypatch):
+    calls = []
+    monkeypatch.setattr(github_committer, "commit_and_push", lambda *a, **k: True)
+
+    def update_jira_ticket(issue_key, comment, config, transition="Done"):
+        calls.append((comment, transition))
+        if transition and len(calls) == 2:
+            raise RuntimeError("no Done")
+
+    monkeypatch.setattr(jira_updater, "update_jira_ticket", update_jira_ticket)
+    config = agent_executor.load_config()
+    with pytest.raises(RuntimeError):
+        agent_executor.run_pipeline("S-1", config)
+    agent_executor.run_pipeline("S-1", config)
+
+    assert calls == [
+        (agent_executor.JIRA_COMMENT, None),
+        (None, "Done"),
+        (None, "Done"),
+    ]
@@ -0,0 +1,45 @@
+import os
+import time
+
+from utils.disk_cache import DiskCache
+
+
+def test_get_set_counts_hits_and_misses(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = cache.make_key("model", "prompt", {})
+
+    assert cache.get(key) is None
+    cache.set(key, "print('hi')")
+    assert cache.get(key) == "print('hi')"
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    for i, key in enumerate(["a", "b"]):
+        cache.set(key, key)
+        os.utime(tmp_path / key, (time.time() - 10 + i, time.time() - 10 + i))
+
+    cache.set("c", "c")
+
+    assert sorted(os.listdir(tmp_path)) == ["b", "c"]
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age=60)
+    cache.set("old", "value")
+    os.utime(tmp_path / "old", (time.time() - 120, time.time() - 120))
+
+    assert cache.get("old") is None
+
+
+def test_reads_do_not_extend_max_age(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age=60)
+    cache.set("key", "value")
+    written = time.time() - 50
+    os.utime(tmp_path / "key", (written, written))
+
+    assert cache.get("key") == "value"
+    assert os.path.getmtime(tmp_path / "key") == written
+    os.utime(tmp_path / "key", (time.time(), time.time() - 70))
+    assert cache.get("key") is None
@@ -0,0 +1,329 @@
+import json
+import sqlite3
+
+import pytest
+
+from benchmarks.load_test import load_module
+from src.store import columnar
+from src.store.backends import open_store
+from src.store.columnar import ColumnarEmployeeStore
+from src.store.memory import InMemoryEmployeeStore
+from src.store.response_cache import response_cache_for
+from src.store.sqlite import SQLiteEmployeeStore
+
+ROWS = [
+    {"id": 1, "name": "Alice", "department": "HR"},
+    {"id": 2, "name": "Bob", "department": "Engineering"},
+    {"id": 3, "name": "Charlie", "department": "HR"},
+]
+
+
+@pytest.fixture(params=["memory", "columnar", "sqlite"])
+def make_store(request, tmp_path):
+    def make(rows=(), case_insensitive=False):
+        if request.param == "memory":
+            return InMemoryEmployeeStore(rows, case_insensitive=case_insensitive)
+        if request.param == "columnar":
+            return ColumnarEmployeeStore(rows, case_insensitive=case_insensitive)
+        store = SQLiteEmployeeStore(
+            str(tmp_path / f"employees-{len(list(tmp_path.iterdir()))}.db"),
+            case_insensitive=case_insensitive,
+        )
+        store.seed(rows)
+        return store
+
+    return make
+
+
+def test_department_index_follows_updates_and_deletes(make_store):
+    store = make_store(ROWS)
+
+    store.update(1, {"department": "Engineering"})
+    store.delete(3)
+    store.insert({"id": 4, "name": "Dana", "department": "HR"})
+
+    assert [row["id"] for row in store.by_department("HR")] == [4]
+    assert [row["id"] for row in store.by_department("Engineering")] == [1, 2]
+    assert store.get(3) is None
+    assert len(store) == 3
+
+
+def test_case_insensitive_department_lookup(make_store):
+    store = make_store(ROWS, case_insensitive=True)
+
+    assert [row["id"] for row in store.by_department("hr")] == [1, 3]
+    assert make_store(ROWS).by_department("hr") == []
+
+
+def test_scrum_25_department_filter_ignores_case(monkeypatch):
+    monkeypatch.delenv("EMPLOYEE_STORE", raising=False)
+    module = load_module("scrum_25_src", "src/SCRUM-25/SCRUM-25.py")
+    client = module.app.test_client()
+
+    def ids(url):
+        return [row["id"] for row in client.get(url).json]
+
+    assert ids("/employees?department=sALES") == [1, 3]
+    assert ids("/employees/dummy") == [1, 3]
+    assert len(client.get("/employees").json) == 5
+
+
+def test_duplicate_id_is_rejected(make_store):
+    store = make_store(ROWS)
+
+    with pytest.raises(ValueError):
+        store.insert({"id": 1, "name": "Again", "department": "HR"})
+
+
+def test_keyset_pagination_walks_every_row_once(make_store):
+    store = make_store(
+        [
+            {"id": i, "name": f"e{i}", "department": "HR" if i % 2 else "Sales"}
+            for i in range(10, 0, -1)
+        ]
+    )
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = store.page(after_id=cursor, limit=3, department="HR")
+        seen.extend(row["id"] for row in rows)
+        if cursor is None:
+            break
+
+    assert seen == [1, 3, 5, 7, 9]
+
+
+def test_response_cache_revalidates_and_invalidates_on_write(make_store):
+    store = make_store(ROWS)
+    cache = response_cache_for(store)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"[]", {}
+
+    body, headers = cache.respond("/employees", {}, None, build)
+    assert cache.respond("/employees", {}, headers["ETag"], build)[0] is None
+    assert cache.respond("/employees", {}, None, build)[0] == body
+    assert len(builds) == 1
+
+    store.delete(1)
+    _, new_headers = cache.respond("/employees", {}, headers["ETag"], build)
+    assert new_headers["ETag"] != headers["ETag"]
+    assert len(builds) == 2
+
+
+def test_response_cache_matches_weak_etags(make_store):
+    cache = response_cache_for(make_store(ROWS))
+    _, headers = cache.respond("/employees", {}, None, lambda: (b"[]", {}))
+
+    for if_none_match in (f"W/{headers['ETag']}", f'"stale", W/{headers["ETag"]}'):
+        assert cache.respond("/employees", {}, if_none_match, None)[0] is None
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    url = f"sqlite:///{tmp_path / 'employees.db'}"
+    writer = open_store(url, rows=ROWS)
+    reader = open_store(url, rows=ROWS)
+    revision = reader.revision
+
+    writer.update(2, {"department": "HR"})
+
+    assert len(reader) == 3
+    assert [row["id"] for row in reader.by_department("HR")] == [1, 2, 3]
+    assert reader.revision > revision
+    with pytest.raises(KeyError):
+        writer.delete(99)
+
+
+def test_salary_range_filter_pages_in_id_order(make_store):
+    store = make_store(
+        [
+            {"id": i, "name": f"e{i}", "department": "HR" if i % 2 else "Sales"}
+            | ({"salary": 1000 * i} if i != 5 else {})
+            for i in range(1, 11)
+        ]
+    )
+
+    rows, cursor = store.page(limit=2, min_salary=3000, max_salary=8000)
+    assert [row["id"] for row in rows] == [3, 4]
+    rows, cursor = store.page(cursor, 10, None, 3000, 8000)
+    assert [row["id"] for row in rows] == [6, 7, 8] and cursor is None
+
+    rows, _ = store.page(department="HR", min_salary=3000)
+    assert [row["id"] for row in rows] == [3, 7, 9]
+
+
+def test_columnar_store_round_trips_rows():
+    rows = [
+        {"id": 2, "name": "Bob", "department": "HR", "salary": 50000},
+        {"id": 1, "name": "Ann", "department": "Sales", "salary": 61000.5},
+        {"id": 3, "department": "HR", "email": "c@example.com"},
+    ]
+    store = ColumnarEmployeeStore(rows)
+
+    assert store.all() == sorted(rows, key=lambda row: row["id"])
+    assert store.update(2, {"salary": 52000})["salary"] == 52000
+    assert store.get(2) == {**rows[0], "salary": 52000}
+    assert store.delete(3) == rows[2]
+    assert [row["id"] for row in store.by_department("HR")] == [2]
+
+
+def test_columnar_store_rejects_non_numeric_salary_untouched():
+    store = ColumnarEmployeeStore(ROWS)
+
+    with pytest.raises(ValueError):
+        store.insert({"id": 4, "name": "Dana", "department": "HR", "salary": "9k"})
+    with pytest.raises(ValueError):
+        store.update(1, {"salary": "9k"})
+
+    assert store.all() == ROWS
+    assert [row["id"] for row in store.by_department("HR")] == [1, 3]
+
+
+def test_columnar_numpy_scan_matches_pure_python(monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    rows = [
+        {
+            "id": i,
+            "department": ("HR", "Sales", "hr")[i % 3],
+            **({"salary": 1000 * (i % 10)} if i % 4 else {}),
+        }
+        for i in range(1, 200)
+    ]
+    store = ColumnarEmployeeStore(rows, case_insensitive=True)
+    monkeypatch.setattr(columnar, "SCAN_CHUNK", 16)
+    queries = [
+        dict(department="HR"),
+        dict(min_salary=3000),
+        dict(department="hr", min_salary=2000, max_salary=6000),
+        dict(after_id=50, limit=7, max_salary=4000),
+    ]
+
+    assert columnar.numpy is numpy
+    with_numpy = [store.page(**query) for query in queries]
+    monkeypatch.setattr(columnar, "numpy", None)
+    assert [store.page(**query) for query in queries] == with_numpy
+
+
+def test_department_stats_follow_every_write(make_store):
+    store = make_store(
+        [
+            {"id": 1, "name": "a", "department": "HR", "salary": 100},
+            {"id": 2, "name": "b", "department": "HR", "salary": 300},
+            {"id": 3, "name": "c", "department": "Sales", "salary": 200},
+            {"id": 4, "name": "d", "department": "Sales"},
+        ]
+    )
+
+    store.delete(1)
+    store.update(3, {"department": "HR", "salary": 50})
+    store.insert({"id": 5, "name": "e", "department": "Ops", "salary": 10})
+    store.delete(5)
+
+    assert store.department_stats() == [
+        {
+            "department": "HR",
+            "count": 2,
+            "total_salary": 350,
+            "avg_salary": 175.0,
+            "min_salary": 50,
+            "max_salary": 300,
+        },
+        {
+            "department": "Sales",
+            "count": 1,
+            "total_salary": 0,
+            "avg_salary": None,
+            "min_salary": None,
+            "max_salary": None,
+        },
+    ]
+
+
+def test_department_stats_total_does_not_drift(make_store):
+    store = make_store(
+        [
+            {"id": 1, "name": "a", "department": "HR", "salary": 0.1},
+            {"id": 2, "name": "b", "department": "HR", "salary": 0.2},
+        ]
+    )
+
+    store.delete(1)
+    assert store.department_stats()[0]["total_salary"] == 0.2
+    store.update(2, {"salary": None})
+    assert store.department_stats()[0]["total_salary"] == 0
+
+
+def test_department_stats_name_follows_remaining_rows(make_store):
+    store = make_store(
+        [
+            {"id": 1, "name": "a", "department": "HR"},
+            {"id": 2, "name": "b", "department": "hr"},
+        ],
+        case_insensitive=True,
+    )
+    assert store.department_stats()[0]["department"] == "HR"
+
+    store.delete(1)
+
+    assert store.department_stats()[0]["department"] == "hr"
+
+
+def test_returned_rows_do_not_alias_stored_rows(make_store):
+    store = make_store(ROWS)
+
+    store.get(1)["department"] = "Sales"
+    store.insert({"id": 4, "name": "Dana", "department": "HR"})["name"] = "X"
+    store.update(2, {"name": "Robert"})["department"] = "Sales"
+
+    assert store.get(1)["department"] == "HR"
+    assert store.get(4)["name"] == "Dana"
+    assert store.get(2)["department"] == "Engineering"
+    assert store.by_department("Sales") == []
+
+
+# The schema SQLiteEmployeeStore created before salary had its own column.
+OLD_SQLITE_SCHEMA = """
+CREATE TABLE employees (
+    id INTEGER PRIMARY KEY,
+    department TEXT NOT NULL,
+    department_key TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX idx_employees_department ON employees (department_key, id);
+CREATE TABLE store_meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+INSERT INTO store_meta (key, value) VALUES ('revision', 0), ('last_modified', 0);
+CREATE TRIGGER employees_insert_revision AFTER INSERT ON employees
+BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'revision'; END;
+"""
+
+
+def test_sqlite_store_migrates_a_database_without_salary_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SQLITE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO employees VALUES (?, ?, ?, ?)",
+        [
+            (1, "HR", "HR", json.dumps({"id": 1, "department": "HR", "salary": 100})),
+            (2, "HR", "HR", json.dumps({"id": 2, "department": "HR", "salary": 300})),
+            (3, "Sales", "Sales", json.dumps({"id": 3, "department": "Sales"})),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteEmployeeStore(path)
+    store.insert({"id": 4, "department": "Sales", "salary": 50})
+
+    assert [row["id"] for row in store.page(min_salary=100)[0]] == [1, 2]
+    assert [
+        (s["department"], s["count"], s["total_salary"])
+        for s in store.department_stats()
+    ] == [
+        ("HR", 2, 400),
+        ("Sales", 2, 50),
+    ]
+    # Reopening an up-to-date database leaves it alone.
+    assert SQLiteEmployeeStore(path).department_stats() == store.department_stats()
@@ -1,6 +1,6 @@
-import pytest
 from fastapi.testclient import TestClient
-from main import app
+
+from src.api.employees import app
 
 client = TestClient(app)
 
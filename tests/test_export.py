@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.load_test import load_module
+from src.api import employees as api
+from src.store.export import NDJSON_MEDIA_TYPE, ndjson_chunks
+from src.store.memory import InMemoryEmployeeStore
+
+ROWS = [
+    {
+        "id": i,
+        "name": f"Employee {i}",
+        "email": f"e{i}@example.com",
+        "department": "HR" if i % 3 == 0 else "Engineering",
+    }
+    for i in range(1, 11)
+]
+
+
+def parse(body):
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_ndjson_chunks_yield_one_chunk_per_page():
+    chunks = list(ndjson_chunks(InMemoryEmployeeStore(ROWS), batch_size=4))
+
+    assert len(chunks) == 3
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert parse(b"".join(chunks)) == ROWS
+
+
+@pytest.fixture
+def fastapi_export():
+    store = InMemoryEmployeeStore(ROWS)
+    api.app.dependency_overrides[api.get_employees_db] = lambda: store
+    client = TestClient(api.app)
+
+    def fetch(url):
+        response = client.get(url)
+        return response.status_code, response.headers["content-type"], response.content
+
+    try:
+        yield fetch
+    finally:
+        api.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def flask_export(monkeypatch):
+    module = load_module("scrum_25", "SCRUM-25.py")
+    monkeypatch.setattr(module, "store", InMemoryEmployeeStore(ROWS))
+    client = module.app.test_client()
+
+    def fetch(url):
+        response = client.get(url)
+        return response.status_code, response.content_type, response.data
+
+    return fetch
+
+
+@pytest.mark.parametrize("app", ["fastapi_export", "flask_export"])
+def test_export_streams_every_row(app, request):
+    fetch = request.getfixturevalue(app)
+
+    status, content_type, body = fetch("/employees/export")
+
+    assert status == 200
+    assert content_type.startswith(NDJSON_MEDIA_TYPE)
+    assert parse(body) == ROWS
+
+
+@pytest.mark.parametrize("app", ["fastapi_export", "flask_export"])
+def test_export_filters_department_and_fields(app, request):
+    fetch = request.getfixturevalue(app)
+
+    status, _, body = fetch("/employees/export?department=HR&fields=id,name")
+
+    assert status == 200
+    assert parse(body) == [
+        {"id": row["id"], "name": row["name"]}
+        for row in ROWS
+        if row["department"] == "HR"
+    ]
+
+
+@pytest.mark.parametrize("app", ["fastapi_export", "flask_export"])
+def test_export_rejects_unknown_fields(app, request):
+    fetch = request.getfixturevalue(app)
+
+    status, _, _ = fetch("/employees/export?fields=ssn")
+
+    assert status == 400
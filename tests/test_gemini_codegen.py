@@ -0,0 +1,54 @@
+import pytest
+
+from agents.gemini_codegen import extract_code
+
+
+def test_extract_code_stops_at_closing_fence():
+    consumed = []
+
+    def stream():
+        for chunk in [
+            "Here you go:\n``",
+            "`python\nprint(1)\n",
+            "```\n",
+            "Key improvements...",
+        ]:
+            consumed.append(chunk)
+            yield chunk
+
+    assert extract_code(stream()) == "print(1)\n"
+    assert "Key improvements..." not in consumed
+
+
+def test_extract_code_returns_unfenced_text_unchanged():
+    assert (
+        extract_code(["import os\n", "print(os.sep)\n"]) == "import os\nprint(os.sep)\n"
+    )
+
+
+def test_extract_code_skips_blocks_in_other_languages():
+    reply = (
+        "Install the dependency first:\n"
+        "```bash\npip install fastapi\n```\n"
+        "Code:\n"
+        "```python\nimport fastapi\n```\n"
+    )
+
+    assert extract_code([reply]) == "import fastapi\n"
+
+
+def test_extract_code_matches_tags_case_insensitively_and_crlf():
+    reply = "Sure:\r\n```Python\r\nx = 1\r\ny = 2\r\n```\r\nDone.\r\n"
+
+    assert extract_code([reply]) == "x = 1\ny = 2\n"
+
+
+def test_extract_code_ignores_fences_inside_a_line():
+    reply = "Use ```python``` syntax.\n```\nprint(2)\n```\n"
+
+    assert extract_code([reply]) == "print(2)\n"
+
+
+def test_extract_code_rejects_replies_without_python_blocks():
+    with pytest.raises(ValueError):
+        extract_code(["Run this:\n```sh\nmake\n```\n"])
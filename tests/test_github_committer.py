@@ -0,0 +1,85 @@
+import pytest
+
+from agents import github_committer
+
+
+class FakeRepo:
+    def __init__(self):
+        self.staged = []
+        self.commits = []
+        self.pushes = 0
+        self.git = self
+        self.index = self
+
+    # repo.git
+    def add(self, *args):
+        self.staged.extend(args[1:])
+
+    # repo.index
+    def diff(self, ref):
+        return list(self.staged)
+
+    def commit(self, message):
+        self.commits.append(message)
+        self.staged = []
+
+    def remote(self, name):
+        return self
+
+    def push(self, branch):
+        self.pushes += 1
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    fake = FakeRepo()
+    monkeypatch.setattr(github_committer, "get_repo", lambda path: fake)
+    return fake
+
+
+def test_pushes_every_n_commits(repo):
+    committer = github_committer.BatchCommitter(push_every=2)
+
+    committer.commit(["a.py"], "one")
+    assert repo.pushes == 0
+    committer.commit(["b.py"], "two")
+    assert repo.pushes == 1 and committer.pending == 0
+    committer.commit(["c.py"], "three")
+    assert repo.pushes == 1 and committer.pending == 1
+
+    committer.push()
+    assert repo.pushes == 2
+    assert repo.commits == ["one", "two", "three"]
+
+
+def test_unchanged_paths_do_not_count_towards_push_every(repo):
+    committer = github_committer.BatchCommitter(push_every=2)
+
+    committer.commit(["a.py"], "one")
+    committer.commit([], "nothing staged")
+
+    assert repo.commits == ["one"]
+    assert committer.pending == 1
+    assert repo.pushes == 0
+
+
+def test_pushes_when_oldest_commit_is_too_old(repo, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(github_committer.time, "monotonic", lambda: now[0])
+    committer = github_committer.BatchCommitter(push_interval=60)
+
+    committer.commit(["a.py"], "one")
+    now[0] += 30
+    committer.commit(["b.py"], "two")
+    assert repo.pushes == 0
+    now[0] += 30
+    committer.commit(["c.py"], "three")
+    assert repo.pushes == 1 and committer.pending == 0
+
+
+def test_commit_and_push_skips_empty_commits(repo):
+    assert github_committer.commit_and_push(".", "one", paths=["a.py"])
+    assert not github_committer.commit_and_push(".", "nothing staged", paths=[])
+
+    assert repo.commits == ["one"]
+    assert repo.pushes == 2
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import HEAVY_MODULES
+
+
+def test_pipeline_import_does_not_load_sdks():
+    code = (
+        "import sys, core.agent_executor; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert out.strip() == "[]"
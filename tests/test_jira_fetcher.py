@@ -0,0 +1,85 @@
+import re
+
+import pytest
+
+from agents import jira_fetcher
+from utils.disk_cache import DiskCache
+
+
+class FakeJira:
+    def __init__(self, issues):
+        self.issues = issues
+        self.calls = []
+
+    def search_issues(self, jql, startAt, maxResults, fields, json_result):
+        self.calls.append((jql, startAt, tuple(fields)))
+        match = re.match(r"key in \((.*)\)", jql)
+        keys = match.group(1).split(", ") if match else sorted(self.issues)
+        found = [
+            {
+                "key": key,
+                "fields": {f: self.issues[key].get(f) for f in fields},
+            }
+            for key in keys
+        ]
+        return {"issues": found[startAt : startAt + maxResults], "total": len(found)}
+
+
+@pytest.fixture
+def jira(monkeypatch, tmp_path):
+    fake = FakeJira(
+        {
+            f"S-{i:03d}": {
+                "updated": "2024-01-01",
+                "summary": f"story {i}",
+                "description": "d",
+                "customfield_12345": "ac",
+            }
+            for i in range(150)
+        }
+    )
+    monkeypatch.setattr(jira_fetcher, "get_jira", lambda config: fake)
+    cache = DiskCache(str(tmp_path))
+    monkeypatch.setattr(jira_fetcher, "get_cache", lambda config: cache)
+    monkeypatch.setattr(jira_fetcher, "PAGE_SIZE", 100)
+    return fake
+
+
+def test_pages_through_search_results(jira):
+    stories = jira_fetcher.fetch_jira_stories("project = S", {})
+
+    assert len(stories) == 150
+    assert stories["S-007"] == {
+        "summary": "story 7",
+        "description": "d",
+        "acceptance_criteria": "ac",
+    }
+    # Two pages of ``updated`` stamps, then full fields for two key batches.
+    assert [(start, fields) for _, start, fields in jira.calls] == [
+        (0, ("updated",)),
+        (100, ("updated",)),
+        (0, ("summary", "description", "customfield_12345")),
+        (0, ("summary", "description", "customfield_12345")),
+    ]
+
+
+def test_only_updated_stories_are_refetched(jira):
+    jira_fetcher.fetch_jira_stories(["S-001", "S-002"], {})
+    jira.issues["S-002"].update(updated="2024-02-01", summary="renamed")
+    jira.calls.clear()
+
+    stories = jira_fetcher.fetch_jira_stories(["S-001", "S-002"], {})
+
+    assert stories["S-002"]["summary"] == "renamed"
+    assert stories["S-001"]["summary"] == "story 1"
+    assert jira.calls[-1][0] == "key in (S-002) ORDER BY key"
+
+
+def test_unchanged_stories_come_from_cache(jira):
+    jira_fetcher.fetch_jira_stories(["S-001"], {})
+    jira.calls.clear()
+
+    assert jira_fetcher.fetch_jira_stories(["S-001"], {})["S-001"]["summary"] == (
+        "story 1"
+    )
+    assert len(jira.calls) == 1  # just the ``updated`` check
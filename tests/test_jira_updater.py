@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from jira import JIRAError
+
+from agents import jira_updater
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def rate_limited(retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    return JIRAError(status_code=429, response=FakeResponse(headers))
+
+
+class FakeJira:
+    def __init__(self, transitions):
+        self.transitions_by_issue = transitions
+        self.failures = []  # exceptions raised by the next calls, in order
+        self.calls = []
+
+    def _call(self, name, *args):
+        self.calls.append((name, *args))
+        if self.failures:
+            raise self.failures.pop(0)
+
+    def add_comment(self, issue_key, comment):
+        self._call("add_comment", issue_key)
+
+    def transitions(self, issue_key):
+        self._call("transitions", issue_key)
+        return [
+            {"name": name, "id": id_}
+            for name, id_ in self.transitions_by_issue[issue_key].items()
+        ]
+
+    def transition_issue(self, issue_key, transition_id):
+        self._call("transition_issue", issue_key, transition_id)
+        if transition_id != self.transitions_by_issue[issue_key]["Done"]:
+            raise JIRAError(status_code=400, text="Transition is not valid")
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    fake = FakeJira(
+        {"P-1": {"Done": "31"}, "P-2": {"Done": "31"}, "Q-1": {"Done": "41"}}
+    )
+    monkeypatch.setattr(jira_updater, "get_jira", lambda config: fake)
+    monkeypatch.setattr(jira_updater, "_transition_ids", {})
+    sleeps = []
+    monkeypatch.setattr(jira_updater.time, "sleep", sleeps.append)
+    fake.sleeps = sleeps
+    return fake
+
+
+def names(calls):
+    return [call[0] for call in calls]
+
+
+def test_retries_rate_limited_calls_with_backoff(jira):
+    jira.failures = [rate_limited(), rate_limited()]
+    updater = jira_updater.JiraUpdater({}, backoff=0.5)
+    updater.queue("P-1", "done")
+
+    assert updater.flush() == {}
+    assert jira.sleeps == [0.5, 1.0]
+    assert names(jira.calls) == ["add_comment"] * 3 + [
+        "transitions",
+        "transition_issue",
+    ]
+
+
+def test_honours_retry_after_seconds_and_http_date(jira):
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    jira.failures = [
+        rate_limited("7"),
+        rate_limited(format_datetime(later, usegmt=True)),
+        rate_limited("not a date"),
+    ]
+    updater = jira_updater.JiraUpdater({}, backoff=0.5)
+    updater.queue("P-1", "done")
+
+    assert updater.flush() == {}
+    assert jira.sleeps[0] == 7.0
+    assert 25 < jira.sleeps[1] <= 30
+    assert jira.sleeps[2] == 2.0  # unparseable: falls back to backoff
+
+
+def test_gives_up_after_max_retries(jira):
+    jira.failures = [rate_limited() for _ in range(3)]
+    updater = jira_updater.JiraUpdater({}, max_retries=2)
+    updater.queue("P-1", "done")
+
+    errors = updater.flush()
+
+    assert errors["P-1"].status_code == 429
+    assert len(jira.sleeps) == 2
+
+
+def test_resolves_transitions_once_per_workflow(jira):
+    updater = jira_updater.JiraUpdater({}, max_workers=1)
+    for issue_key in ("P-1", "P-2", "Q-1"):
+        updater.queue(issue_key, "done")
+
+    assert updater.flush() == {}
+    assert [c[1] for c in jira.calls if c[0] == "transitions"] == ["P-1", "Q-1"]
+    assert ("transition_issue", "Q-1", "41") in jira.calls
+    assert jira_updater._transition_ids == {"P": {"Done": "31"}, "Q": {"Done": "41"}}
+
+
+def test_re_resolves_a_stale_transition_id(jira):
+    jira_updater._transition_ids["P"] = {"Done": "99"}
+    updater = jira_updater.JiraUpdater({})
+    updater.queue("P-1", "done")
+
+    assert updater.flush() == {}
+    assert jira.calls[1:] == [
+        ("transition_issue", "P-1", "99"),
+        ("transitions", "P-1"),
+        ("transition_issue", "P-1", "31"),
+    ]
+    assert jira_updater._transition_ids["P"] == {"Done": "31"}
+
+
+def test_comment_and_transition_can_be_skipped(jira):
+    updater = jira_updater.JiraUpdater({})
+    updater.queue("P-1", "done", transition=None)
+    updater.queue("P-2", None)
+
+    assert updater.flush() == {}
+    assert [c[:2] for c in jira.calls] == [
+        ("add_comment", "P-1"),
+        ("transitions", "P-2"),
+        ("transition_issue", "P-2"),
+    ]
+    assert updater.commented == {"P-1"}
+
+
+def test_records_comment_even_when_transition_fails(jira):
+    jira.transitions_by_issue["P-1"] = {"Start": "11"}
+    updater = jira_updater.JiraUpdater({})
+    updater.queue("P-1", "done")
+
+    assert isinstance(updater.flush()["P-1"], ValueError)
+    assert updater.commented == {"P-1"}
@@ -0,0 +1,48 @@
+from agents import linter_agent
+
+# Black keeps this 82-character line and spaces the slice with " : ", which
+# flake8's defaults would report as E501 and E203.
+BLACK_CLEAN = (
+    "def window(items, start, offset):\n"
+    "    return items[start + offset : start + offset + 10]"
+    "  # a comment that runs long\n"
+)
+
+
+def test_black_output_passes_flake8_and_is_cached(tmp_path):
+    path = tmp_path / "clean.py"
+    path.write_text(BLACK_CLEAN)
+    cache_dir = str(tmp_path / "cache")
+
+    (first,) = linter_agent.lint_files([str(path)], cache_dir=cache_dir)
+    (second,) = linter_agent.lint_files([str(path)], cache_dir=cache_dir)
+
+    assert first.ok and not first.reformatted and not first.cached
+    assert second.cached
+
+
+def test_sharded_run_aggregates_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(linter_agent, "PARALLEL_MIN_FILES", 2)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"mod{i}.py"
+        # Odd files import a name they never use (F401) and need reformatting.
+        path.write_text("import os\nx=1\n" if i % 2 else f"X{i} = 1\n")
+        paths.append(str(path))
+
+    results = linter_agent.lint_files(
+        paths, cache_dir=str(tmp_path / "cache"), workers=2
+    )
+    summary = linter_agent.report(results)
+
+    assert [r.path for r in results] == paths
+    assert summary["files"] == 4
+    assert summary["reformatted"] == [paths[1], paths[3]]
+    assert [d.split(":")[0] for d in summary["diagnostics"]] == [paths[1], paths[3]]
+    assert all(" F401 " in d for d in summary["diagnostics"])
+
+
+def test_format_code_matches_black_and_passes_invalid_code_through():
+    assert linter_agent.format_code("x=1\n") == "x = 1\n"
+    assert linter_agent.format_code("x = 1\n") == "x = 1\n"
+    assert linter_agent.format_code("def (:\n") == "def (:\n"
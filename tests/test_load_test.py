@@ -0,0 +1,25 @@
+from benchmarks import load_test
+from src.api import employees as api
+
+OPTIONS = {
+    "store": "memory",
+    "scenarios": list(load_test.SCENARIOS),
+    "departments": 3,
+    "concurrency": 2,
+    "seconds": 0,
+    "min_requests": 4,
+    "page_size": 5,
+}
+
+
+def test_every_app_serves_every_scenario():
+    for app in load_test.APPS:
+        try:
+            case = load_test.run_case(app, 20, OPTIONS)
+        finally:
+            api.app.dependency_overrides.clear()
+
+        assert case["peak_rss_mb"] > 0
+        for stats in case["scenarios"].values():
+            assert stats["requests"] == 4
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
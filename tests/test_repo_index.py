@@ -0,0 +1,107 @@
+import pytest
+
+from agents import repo_index
+from agents.prompt_generator import generate_prompt
+
+API = """from fastapi import FastAPI
+from pydantic import BaseModel
+
+app = FastAPI()
+
+
+class Employee(BaseModel):
+    id: int
+    department: str
+
+
+@app.get("/employees")
+def list_employees():
+    return []
+"""
+
+
+def make_index(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "api.py").write_text(API)
+    (tmp_path / "src" / "util.py").write_text("def unrelated_helper():\n    return 1\n")
+    (tmp_path / "scratch.py").write_text("def list_employees_draft():\n    pass\n")
+    return repo_index.RepoIndex(
+        root=str(tmp_path), index_path=str(tmp_path / ".cache" / "index.json")
+    )
+
+
+def test_extracts_routes_and_models(tmp_path):
+    index = make_index(tmp_path)
+    index.refresh()
+
+    kinds = {(s.name, s.kind, s.route) for s in index.symbols()}
+    assert ("list_employees", "route", "GET /employees") in kinds
+    assert ("Employee", "model", None) in kinds
+    assert ("unrelated_helper", "function", None) in kinds
+
+
+def test_refresh_reparses_only_changed_files(tmp_path):
+    index = make_index(tmp_path)
+    assert sorted(index.refresh()) == ["src/api.py", "src/util.py"]
+
+    (tmp_path / "src" / "util.py").write_text("def other_helper():\n    return 2\n")
+    reloaded = repo_index.RepoIndex(
+        root=str(tmp_path), index_path=str(tmp_path / ".cache" / "index.json")
+    )
+    assert reloaded.refresh() == ["src/util.py"]
+    assert "other_helper" in {s.name for s in reloaded.symbols()}
+
+
+def test_selection_ranks_matching_route_first_within_budget(tmp_path):
+    index = make_index(tmp_path)
+    index.refresh()
+    query = "List employees of a department via GET /employees"
+
+    assert [s.name for s in index.select(query, budget_tokens=10_000)][:2] == [
+        "list_employees",
+        "Employee",
+    ]
+    assert [s.name for s in index.select(query, budget_tokens=40)] == ["list_employees"]
+
+
+def test_only_configured_roots_are_indexed(tmp_path):
+    make_index(tmp_path)
+    index = repo_index.RepoIndex(
+        root=str(tmp_path),
+        index_path=str(tmp_path / "index.json"),
+        roots=["src", "."],
+    )
+
+    assert sorted(index.refresh()) == ["scratch.py", "src/api.py", "src/util.py"]
+
+
+def test_context_starts_with_the_full_target_file(tmp_path, monkeypatch):
+    index = make_index(tmp_path)
+    monkeypatch.setattr(repo_index, "_index", index)
+    story = {"summary": "Use the unrelated helper", "description": "employees"}
+
+    context = repo_index.build_context(
+        story, {"prompt_token_budget": 2000}, "src/api.py"
+    )
+
+    assert context.startswith(f"# src/api.py, full file\n{API}")
+    assert "# src/util.py, lines 1-2" in context
+    assert context.count("def list_employees") == 1
+
+    with pytest.raises(ValueError, match="prompt_token_budget"):
+        repo_index.build_context(story, {"prompt_token_budget": 40}, "src/api.py")
+
+
+def test_prompt_includes_context_only_when_given():
+    story = {"summary": "s", "description": "d", "acceptance_criteria": "a"}
+
+    assert "```python" not in generate_prompt(story)
+    assert "def list_employees" in generate_prompt(story, "def list_employees(): ...")
+
+
+def test_prompt_asks_for_the_whole_target_file():
+    story = {"summary": "s", "description": "d", "acceptance_criteria": "a"}
+
+    prompt = generate_prompt(story, "app = FastAPI()", "src/api/employees.py")
+
+    assert "complete updated contents of src/api/employees.py" in prompt
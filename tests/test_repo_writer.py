@@ -0,0 +1,49 @@
+import os
+import stat
+
+import pytest
+
+from agents import repo_writer
+from agents.repo_writer import write_code_to_repo
+
+
+def test_creates_missing_file_and_directories(tmp_path):
+    path = tmp_path / "src" / "api" / "new.py"
+
+    assert write_code_to_repo("x = 1\n", str(path))
+    assert path.read_text() == "x = 1\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("x = 1\n")
+    os.utime(path, (1_000_000, 1_000_000))
+
+    assert not write_code_to_repo("x = 1\n", str(path))
+    assert path.stat().st_mtime == 1_000_000
+
+
+def test_rewrite_preserves_file_mode(tmp_path):
+    path = tmp_path / "script.py"
+    path.write_text("x = 1\n")
+    path.chmod(0o755)
+
+    assert write_code_to_repo("x = 2\n", str(path))
+    assert path.read_text() == "x = 2\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o755
+
+
+def test_temp_file_removed_when_replace_fails(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text("x = 1\n")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo_writer.os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_code_to_repo("x = 2\n", str(path))
+
+    assert os.listdir(tmp_path) == ["mod.py"]
+    assert path.read_text() == "x = 1\n"
@@ -0,0 +1,37 @@
+import os
+
+from core.run_ledger import RunLedger
+
+
+def test_rerun_reuses_completed_stages(tmp_path):
+    ledger = RunLedger("SCRUM-1", str(tmp_path))
+    ledger.record("fetch", {"summary": "List employees"})
+    ledger.record("codegen", "print('hi')\n")
+    ledger.record("commit", "push rejected", status="failed")
+
+    resumed = RunLedger("SCRUM-1", str(tmp_path))
+
+    assert resumed.completed("fetch")
+    assert resumed.output("codegen") == "print('hi')\n"
+    assert not resumed.completed("commit")
+
+
+def test_finished_run_starts_fresh(tmp_path):
+    ledger = RunLedger("SCRUM-1", str(tmp_path))
+    ledger.record("fetch", {"summary": "List employees"})
+    ledger.finish()
+
+    assert not RunLedger("SCRUM-1", str(tmp_path)).completed("fetch")
+
+
+def test_finish_prunes_artifacts_no_open_run_needs(tmp_path):
+    done = RunLedger("SCRUM-1", str(tmp_path))
+    other = RunLedger("SCRUM-2", str(tmp_path))
+    done.record("fetch", {"summary": "List employees"})
+    done.record("codegen", "print('hi')\n")
+    other.record("codegen", "print('hi')\n")
+
+    done.finish()
+
+    assert len(os.listdir(tmp_path / "artifacts")) == 1
+    assert RunLedger("SCRUM-2", str(tmp_path)).output("codegen") == "print('hi')\n"
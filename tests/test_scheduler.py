@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from core.scheduler import Stage, StageTimeout, run_stages
+from utils.tracing import Tracer, annotate
+
+
+def test_independent_stages_run_concurrently():
+    both_started = threading.Barrier(2, timeout=2)
+
+    def left():
+        both_started.wait()
+        return 1
+
+    def right():
+        both_started.wait()
+        return 2
+
+    results = run_stages(
+        [
+            Stage("left", left),
+            Stage("right", right),
+            Stage("sum", lambda left, right: left + right, inputs=("left", "right")),
+        ]
+    )
+
+    assert results["sum"] == 3
+
+
+def test_failed_stage_is_retried():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("try again")
+        return "ok"
+
+    results = run_stages([Stage("flaky", flaky, retries=2, backoff=0)])
+
+    assert results["flaky"] == "ok"
+    assert len(calls) == 3
+
+
+def test_stage_timeout():
+    with pytest.raises(StageTimeout):
+        run_stages([Stage("slow", lambda: time.sleep(1), timeout=0.05)])
+
+
+def test_seeded_results_satisfy_inputs():
+    results = run_stages(
+        [Stage("double", lambda base: base * 2, inputs=("base",))],
+        results={"base": 21},
+    )
+
+    assert results["double"] == 42
+
+
+def test_timed_stage_sees_the_callers_tracing_span():
+    tracer = Tracer()
+
+    def wrap(stage, call):
+        with tracer.span(stage.name):
+            return call()
+
+    run_stages([Stage("timed", lambda: annotate(tokens=7), timeout=5)], wrap=wrap)
+
+    assert tracer.records[0]["tokens"] == 7
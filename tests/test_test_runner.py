@@ -0,0 +1,51 @@
+from agents import test_runner
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_repo(root):
+    write(root / "pkg" / "core.py", "VALUE = 1\n")
+    write(root / "pkg" / "api.py", "from pkg.core import VALUE\n")
+    write(root / "pkg" / "other.py", "OTHER = 2\n")
+    write(
+        root / "tests" / "test_api.py",
+        "from pkg import api\n\n\ndef test_value():\n    assert api.VALUE == 1\n",
+    )
+    write(
+        root / "tests" / "test_other.py",
+        "import pkg.other\n\n\ndef test_other():\n    assert pkg.other.OTHER == 2\n",
+    )
+
+
+def test_selects_tests_through_transitive_imports(tmp_path):
+    make_repo(tmp_path)
+    tests = test_runner.discover_tests(root=str(tmp_path))
+
+    selected = test_runner.select_tests(["pkg/core.py"], tests, str(tmp_path))
+
+    assert list(selected) == ["tests/test_api.py"]
+    assert selected["tests/test_api.py"] == {
+        "tests/test_api.py",
+        "pkg/api.py",
+        "pkg/core.py",
+    }
+
+
+def test_passing_results_are_cached_until_an_import_changes(tmp_path):
+    make_repo(tmp_path)
+    root, cache_dir = str(tmp_path), str(tmp_path / ".cache")
+
+    def run():
+        results = test_runner.run_tests(["pkg/core.py"], root=root, cache_dir=cache_dir)
+        return test_runner.report(results)
+
+    assert run() == {"tests": 1, "cached": 0, "failed": [], "output": {}}
+    assert run()["cached"] == 1
+
+    write(tmp_path / "pkg" / "core.py", "VALUE = 2\n")
+    summary = run()
+    assert summary["failed"] == ["tests/test_api.py"]
+    assert "assert 2 == 1" in summary["output"]["tests/test_api.py"]
@@ -0,0 +1,17 @@
+from utils.tracing import Tracer
+
+
+def test_summary_leaves_out_resumed_spans():
+    tracer = Tracer()
+    for _ in range(3):
+        with tracer.span("codegen", "S-1"):
+            pass
+    with tracer.span("codegen", "S-2", resumed=True):
+        pass
+    with tracer.span("fetch", "S-2", resumed=True):
+        pass
+
+    summary = tracer.summary()
+
+    assert list(summary) == ["codegen"]
+    assert summary["codegen"]["count"] == 3
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class DiskCache:
+    """Content-addressed text cache stored as one file per entry.
+
+    Entries written more than ``max_age`` seconds ago are treated as misses,
+    however often they are read. The least recently used entries are evicted
+    once the cache holds more than ``max_entries`` files or ``max_bytes``
+    bytes.
+    """
+
+    def __init__(self, directory, max_entries=None, max_bytes=None, max_age=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts):
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            created = os.stat(path).st_mtime
+            if self.max_age is not None and time.time() - created > self.max_age:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, encoding="utf-8") as f:
+                value = f.read()
+            # atime tracks use for LRU eviction; mtime stays the creation time.
+            os.utime(path, (time.time(), created))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            entries = []
+            now = time.time()
+            for name in os.listdir(self.directory):
+                if name.startswith(".tmp-"):
+                    continue
+                path = self._path(name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                    os.remove(path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+
+            entries.sort()
+            total_bytes = sum(size for _, size, _ in entries)
+            while entries and (
+                (self.max_entries is not None and len(entries) > self.max_entries)
+                or (self.max_bytes is not None and total_bytes > self.max_bytes)
+            ):
+                _, size, path = entries.pop(0)
+                total_bytes -= size
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# A context variable rather than a thread-local, so code that hands work to
+# another thread can carry the span along with contextvars.copy_context().
+_span = ContextVar("span", default=None)
+
+
+def annotate(**fields):
+    """Attach fields to the span active in this context, if any."""
+    record = _span.get()
+    if record is not None:
+        record.update(fields)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (which must be non-empty)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class Tracer:
+    """Records one span per pipeline stage and writes them as JSON lines.
+
+    Each span captures wall time and status plus whatever the stage reports
+    (bytes and tokens in/out, cache hits), either through the yielded record
+    or via ``annotate()`` from code running inside it.
+    """
+
+    def __init__(self, trace_dir=None, run_id=None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.records = []
+        self.path = None
+        self._lock = threading.Lock()
+        if trace_dir is not None:
+            os.makedirs(trace_dir, exist_ok=True)
+            self.path = os.path.join(trace_dir, f"{self.run_id}.jsonl")
+
+    @contextmanager
+    def span(self, stage, issue_key=None, **fields):
+        record = {
+            "run_id": self.run_id,
+            "stage": stage,
+            "issue_key": issue_key,
+            "start": time.time(),
+            **fields,
+        }
+        token = _span.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+            record.setdefault("status", "ok")
+        except BaseException as exc:
+            record["status"] = "error"
+            record["error"] = repr(exc)
+            raise
+        finally:
+            record["duration"] = time.perf_counter() - started
+            _span.reset(token)
+            self._emit(record)
+
+    def _emit(self, record):
+        with self._lock:
+            self.records.append(record)
+            if self.path is not None:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    def summary(self):
+        """Per-stage count, total, p50 and p95 wall time across the run.
+
+        Spans for stages replayed from a run ledger (``resumed=True``) are
+        left out; they take no time and would drag the percentiles down.
+        """
+        durations = {}
+        for record in self.records:
+            if record.get("resumed"):
+                continue
+            durations.setdefault(record["stage"], []).append(record["duration"])
+        return {
+            stage: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for stage, values in durations.items()
+        }
+
+    def write_summary(self):
+        summary = self.summary()
+        if self.path is not None:
+            with open(
+                self.path[: -len(".jsonl")] + ".summary.json", "w", encoding="utf-8"
+            ) as f:
+                json.dump(summary, f, indent=2)
+        return summary